@@ -7,7 +7,7 @@ a = Analysis(
     binaries=[],
     datas=[('src', 'src'), ('.env', '.'), ('logs', 'logs'), ('checkpoints', 'checkpoints')],
     hiddenimports=['sqlalchemy', 'psycopg2', 'alembic', 'dotenv', 'dateutil', 'dateutil.parser', 'dateutil.tz', 
-                  'requests', 'urllib3', 'certifi', 'charset_normalizer', 'idna',
+                  'requests', 'urllib3', 'certifi', 'charset_normalizer', 'idna', 'ijson', 'ijson.backends.python',
                   'logging', 'logging.handlers', 'logging.config', 'logging.handlers.RotatingFileHandler'],
     hookspath=[],
     hooksconfig={},
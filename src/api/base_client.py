@@ -4,15 +4,35 @@ from typing import Any, Dict, Optional
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 
 from .exceptions import (KeapAPIError, KeapAuthenticationError, KeapNotFoundError, KeapQuotaExhaustedError, KeapRateLimitError, KeapServerError)
-from ..utils.retry import exponential_backoff
+from ..utils.retry import AIMDController, CircuitBreaker, SlidingWindowLimiter, exponential_backoff
 
 # Get logger for this module
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+# Loaders call the API from several threads (e.g. concurrent order loading), so the
+# pool must hold enough keep-alive connections for all of them. Retries are handled
+# by exponential_backoff, not by urllib3.
+HTTP_POOL_SIZE = 32
+
+# Concurrent API requests across all clients of the process; lowered when Keap throttles
+# and raised again as requests succeed, so throttled workers do not all retry at once
+request_concurrency = AIMDController(max_limit=HTTP_POOL_SIZE)
+
+# Requests per throttle window across all clients of the process, set from the product
+# throttle headers of the first responses so requests are paced before Keap rejects them
+request_rate_limiter = SlidingWindowLimiter()
+
+# Pause of all requests after consecutive throttled requests, so queued requests are not each sent and rejected
+request_circuit_breaker = CircuitBreaker(fail_threshold=3, cool_off=30.0)
+
+# Seconds per unit of the x-keap-*-throttle-time-unit headers
+THROTTLE_TIME_UNITS = {'second': 1.0, 'minute': 60.0, 'hour': 3600.0, 'day': 86400.0}
+
 
 class KeapBaseClient:
     def __init__(self):
@@ -26,6 +46,7 @@ class KeapBaseClient:
         # Initialize session for connection pooling
         self.session = requests.Session()
         self.session.headers.update(self.headers)
+        self.session.mount('https://', HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=0))
 
         logger.info("KeapBaseClient initialized")
         logger.info(f"Using base URL: {self.base_url}")
@@ -40,6 +61,15 @@ class KeapBaseClient:
         except (ValueError, TypeError):
             return default
 
+    def _update_rate_limit(self, throttle_headers: Dict[str, Optional[str]]) -> None:
+        """Pace requests to the product throttle limit reported in the response headers, if any."""
+        limit = self.safe_int_parse(throttle_headers.get('x-keap-product-throttle-limit'))
+        unit_seconds = THROTTLE_TIME_UNITS.get((throttle_headers.get('x-keap-product-throttle-time-unit') or '').lower())
+        if limit <= 0 or unit_seconds is None:
+            return
+        interval = self.safe_int_parse(throttle_headers.get('x-keap-product-throttle-interval'), default=1) or 1
+        request_rate_limiter.set_limit(limit, interval * unit_seconds)
+
     @staticmethod
     def has_meaningful_value(value):
         """Check if a header value is meaningful (not empty, None, or whitespace-only)"""
@@ -80,6 +110,8 @@ class KeapBaseClient:
                           'x-keap-tenant-throttle-available': response.headers.get('x-keap-tenant-throttle-available'),
                           'x-keap-tenant-throttle-used': response.headers.get('x-keap-tenant-throttle-used')}
 
+        self._update_rate_limit(throttle_headers)
+
         logger.debug("Quota Headers: %s", quota_headers)
         logger.debug("Throttle Headers: %s", throttle_headers)
         logger.debug("Tenant Headers: %s", tenant_headers)
@@ -157,8 +189,8 @@ class KeapBaseClient:
                     limit_type = "unknown"
                     limit_value = 0
 
-                # Combine all headers for the rate limit error
-                all_headers = {**quota_headers, **throttle_headers, **tenant_headers}
+                # Combine all headers for the rate limit error, with the server's retry hint if it sent one
+                all_headers = {**quota_headers, **throttle_headers, **tenant_headers, 'retry-after': response.headers.get('Retry-After')}
 
                 raise KeapRateLimitError(f"Rate limit exceeded ({limit_type}, limit: {limit_value}). "
                                          f"Will retry after throttle period.", response_headers=all_headers)
@@ -174,7 +206,8 @@ class KeapBaseClient:
             logger.error(f"Request Error: {str(e)}")
             raise KeapAPIError(f"Request failed: {str(e)}")
 
-    @exponential_backoff(max_retries=5, base_delay=1.0, max_delay=60.0, exponential_base=2.0, jitter=True, exceptions=(KeapRateLimitError, KeapServerError))
+    @exponential_backoff(max_retries=5, base_delay=1.0, max_delay=60.0, exponential_base=2.0, jitter=True, exceptions=(KeapRateLimitError, KeapServerError),
+                         concurrency=request_concurrency, rate_limiter=request_rate_limiter, circuit_breaker=request_circuit_breaker)
     def _make_request(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict:
         """
         Make an HTTP request to the Keap API with retry logic for rate limits
@@ -1,11 +1,13 @@
 import logging
+from datetime import datetime, timezone
+from functools import partial
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import parse_qs, urlparse
 
 from src.transformers.transformers import (transform_account_profile, transform_affiliate, transform_affiliate_clawback, transform_affiliate_commission, transform_affiliate_payment,
                                            transform_affiliate_program, transform_affiliate_redirect, transform_affiliate_summary, transform_applied_tag, transform_campaign,
                                            transform_contact_with_related, transform_credit_card, transform_custom_field, transform_list_response, transform_note, transform_opportunity,
-                                           transform_order_item, transform_order_payment, transform_order_transaction, transform_order_with_items, transform_payment_gateway, transform_payment_plan,
+                                           transform_order_item, transform_order_payment_row, transform_order_transaction_row, transform_order_with_items, transform_payment_gateway, transform_payment_plan,
                                            transform_product, transform_subscription, transform_tag, transform_task)
 from .base_client import KeapBaseClient
 from .exceptions import KeapNotFoundError
@@ -153,7 +155,8 @@ class KeapClient(KeapBaseClient):
         params = self._prepare_params(limit=limit, offset=offset, since=since, **additional_params)
         response = self.get(f'contacts/{contact_id}/tags', params)
         # Use a different transformer for the applied tags response
-        items = [transform_applied_tag(tag_data) for tag_data in response.get('tags', [])]
+        now = datetime.now(timezone.utc)
+        items = [transform_applied_tag(tag_data, now=now) for tag_data in response.get('tags', [])]
         pagination = {'next': None, 'count': len(items), 'total': len(items)}
         return items, pagination
 
@@ -321,7 +324,7 @@ class KeapClient(KeapBaseClient):
         """
         params = self._prepare_params(limit=limit, offset=offset, since=since, contact_id=contact_id, **additional_params)
         response = self.get('opportunities', params)
-        return transform_list_response(response, transform_opportunity)
+        return transform_list_response(response, transform_opportunity, 'opportunities')
 
     def get_opportunity(self, opportunity_id: int) -> Opportunity:
         """Get a single opportunity by ID.
@@ -359,7 +362,7 @@ class KeapClient(KeapBaseClient):
         """
         params = self._prepare_params(limit=limit, offset=offset, since=since, subscription_only=subscription_only, **additional_params)
         response = self.get('products', params)
-        return transform_list_response(response, transform_product)
+        return transform_list_response(response, transform_product, 'products')
 
     def get_product(self, product_id: int) -> Product:
         """Get a single product by ID."""
@@ -389,7 +392,7 @@ class KeapClient(KeapBaseClient):
 
         params = self._prepare_params(limit=limit, offset=offset, since=since, contact_id=contact_id, **additional_params)
         response = self.get('orders', params)
-        return transform_list_response(response, transform_order_with_items)
+        return transform_list_response(response, transform_order_with_items, 'orders')
 
     def get_order(self, order_id: int) -> Order:
         """Get a single order by ID with its items."""
@@ -414,6 +417,17 @@ class KeapClient(KeapBaseClient):
         Returns:
             List of OrderPayment objects
         """
+        return [OrderPayment(**row) for row in self.get_order_payment_rows(order_id)]
+
+    def get_order_payment_rows(self, order_id: int) -> List[Dict[str, Any]]:
+        """Get payments for a specific order as column values, for callers that write them with Core statements.
+        
+        Args:
+            order_id: The ID of the order to get payments for
+            
+        Returns:
+            List of OrderPayment column value dicts
+        """
         try:
             response = self._make_request('GET', f'orders/{order_id}/payments')
             if not response:
@@ -438,7 +452,7 @@ class KeapClient(KeapBaseClient):
                 logger.warning(f"Unexpected response format for order payments {order_id}: {type(response)}")
                 return []
             
-            return [transform_order_payment(payment) for payment in payments]
+            return [transform_order_payment_row(payment) for payment in payments]
         except Exception as e:
             logger.error(f"Error getting payments for order {order_id}: {str(e)}")
             return []
@@ -452,6 +466,17 @@ class KeapClient(KeapBaseClient):
         Returns:
             List of OrderTransaction objects
         """
+        return [OrderTransaction(**row) for row in self.get_order_transaction_rows(order_id)]
+
+    def get_order_transaction_rows(self, order_id: int) -> List[Dict[str, Any]]:
+        """Get transactions for a specific order as column values, for callers that write them with Core statements.
+        
+        Args:
+            order_id: The ID of the order to get transactions for
+            
+        Returns:
+            List of OrderTransaction column value dicts
+        """
         try:
             response = self._make_request('GET', f'orders/{order_id}/transactions')
             if not response:
@@ -476,7 +501,8 @@ class KeapClient(KeapBaseClient):
                 logger.warning(f"Unexpected response format for order transactions {order_id}: {type(response)}")
                 return []
             
-            return [transform_order_transaction(transaction) for transaction in transactions]
+            now = datetime.now(timezone.utc)
+            return [transform_order_transaction_row(transaction, now=now) for transaction in transactions]
         except Exception as e:
             logger.error(f"Error getting transactions for order {order_id}: {str(e)}")
             return []
@@ -549,7 +575,7 @@ class KeapClient(KeapBaseClient):
 
             params = self._prepare_params(limit=limit, offset=offset, since=since, contact_id=contact_id, **additional_params)
             response = self.get('tasks', params)
-            return transform_list_response(response, transform_task)
+            return transform_list_response(response, transform_task, 'tasks')
         except Exception as e:
             logger.error(f"Error fetching tasks: {str(e)}")
             return [], {'next': None, 'count': 0, 'total': 0}
@@ -594,7 +620,7 @@ class KeapClient(KeapBaseClient):
 
             params = self._prepare_params(limit=limit, offset=offset, since=since, contact_id=contact_id, **additional_params)
             response = self.get('notes', params)
-            return transform_list_response(response, transform_note)
+            return transform_list_response(response, transform_note, 'notes')
         except Exception as e:
             logger.error(f"Error fetching notes: {str(e)}")
             return [], {'next': None, 'count': 0, 'total': 0}
@@ -633,7 +659,7 @@ class KeapClient(KeapBaseClient):
         """
         params = self._prepare_params(limit=limit, offset=offset, since=since, **additional_params)
         response = self.get('campaigns', params)
-        return transform_list_response(response, transform_campaign)
+        return transform_list_response(response, transform_campaign, 'campaigns')
 
     def get_campaign(self, campaign_id: int) -> Campaign:
         """Get a single campaign by ID."""
@@ -660,7 +686,7 @@ class KeapClient(KeapBaseClient):
         """
         params = self._prepare_params(limit=limit, offset=offset, since=since, contact_id=contact_id, **additional_params)
         response = self.get('subscriptions', params)
-        return transform_list_response(response, transform_subscription)
+        return transform_list_response(response, transform_subscription, 'subscriptions')
 
     # Account Related Methods
     def get_account_profile(self) -> AccountProfile:
@@ -686,7 +712,7 @@ class KeapClient(KeapBaseClient):
         """
         params = self._prepare_params(limit=limit, offset=offset, since=since, **additional_params)
         response = self.get('affiliates', params)
-        return transform_list_response(response, transform_affiliate)
+        return transform_list_response(response, transform_affiliate, 'affiliates')
 
     def get_affiliate(self, affiliate_id: int) -> Affiliate:
         """Get a single affiliate by ID."""
@@ -710,7 +736,7 @@ class KeapClient(KeapBaseClient):
         """
         params = self._prepare_params(limit=limit, offset=offset, since=since, **additional_params)
         response = self.get(f'affiliates/{affiliate_id}/commissions', params)
-        return transform_list_response(response, transform_affiliate_commission)
+        return transform_list_response(response, transform_affiliate_commission, 'commissions')
 
     def get_affiliate_programs(self, affiliate_id: int, limit: int = 50, offset: int = 0, since: Optional[str] = None, **additional_params) -> Tuple[List[AffiliateProgram], Dict[str, Any]]:
         """Get programs for an affiliate.
@@ -729,7 +755,7 @@ class KeapClient(KeapBaseClient):
         """
         params = self._prepare_params(limit=limit, offset=offset, since=since, **additional_params)
         response = self.get(f'affiliates/{affiliate_id}/programs', params)
-        return transform_list_response(response, transform_affiliate_program)
+        return transform_list_response(response, transform_affiliate_program, 'programs')
 
     def get_affiliate_redirects(self, affiliate_id: int, limit: int = 50, offset: int = 0, since: Optional[str] = None, **additional_params) -> Tuple[List[AffiliateRedirect], Dict[str, Any]]:
         """Get redirects for an affiliate.
@@ -748,7 +774,7 @@ class KeapClient(KeapBaseClient):
         """
         params = self._prepare_params(limit=limit, offset=offset, since=since, **additional_params)
         response = self.get(f'affiliates/{affiliate_id}/redirects', params)
-        return transform_list_response(response, transform_affiliate_redirect)
+        return transform_list_response(response, transform_affiliate_redirect, 'redirects')
 
     def get_affiliate_summary(self, affiliate_id: int) -> AffiliateSummary:
         """Get summary for an affiliate."""
@@ -772,7 +798,7 @@ class KeapClient(KeapBaseClient):
         """
         params = self._prepare_params(limit=limit, offset=offset, since=since, **additional_params)
         response = self.get(f'affiliates/{affiliate_id}/clawbacks', params)
-        return transform_list_response(response, transform_affiliate_clawback)
+        return transform_list_response(response, transform_affiliate_clawback, 'clawbacks')
 
     def get_affiliate_payments(self, affiliate_id: int, limit: int = 50, offset: int = 0, since: Optional[str] = None, **additional_params) -> Tuple[List[AffiliatePayment], Dict[str, Any]]:
         """Get payments for an affiliate.
@@ -791,7 +817,7 @@ class KeapClient(KeapBaseClient):
         """
         params = self._prepare_params(limit=limit, offset=offset, since=since, **additional_params)
         response = self.get(f'affiliates/{affiliate_id}/payments', params)
-        return transform_list_response(response, transform_affiliate_payment)
+        return transform_list_response(response, transform_affiliate_payment, 'payments')
 
     # Tag Related Methods
     def get_tags(self, limit: int = 50, offset: int = 0, since: Optional[str] = None, **additional_params) -> Tuple[List[Tag], Dict[str, Any]]:
@@ -817,7 +843,8 @@ class KeapClient(KeapBaseClient):
                 logger.warning("Empty response received from tags API")
                 return [], {'next': None, 'previous': None, 'count': 0, 'limit': limit, 'offset': offset}
 
-            return transform_list_response(response, transform_tag)
+            # One timestamp for the tags of the page that have no created_at
+            return transform_list_response(response, partial(transform_tag, now=datetime.now(timezone.utc)), 'tags')
 
         except Exception as e:
             logger.error(f"Error fetching tags: {str(e)}")
@@ -0,0 +1,99 @@
+"""
+Bulk insert helper that streams large batches of new rows with COPY.
+
+Small batches are inserted with an executemany INSERT; batches of at least
+COPY_MIN_ROWS rows on a psycopg2 connection are sent with COPY FROM STDIN,
+which skips per-row statement handling on the server.
+"""
+
+import enum
+import io
+import json
+import logging
+from datetime import date, datetime
+from typing import Any, Dict, List
+
+from sqlalchemy import JSON, insert
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Minimum number of rows for which COPY is used instead of an executemany INSERT
+COPY_MIN_ROWS = 500
+
+# Whether the fallback from COPY to an executemany INSERT on a non-psycopg2 driver has been logged
+_copy_fallback_logged = False
+
+
+def insert_rows(db: Session, model: Any, rows: List[Dict[str, Any]]) -> None:
+    """Insert new rows, with COPY when the batch is large enough.
+
+    Rows must all have the same columns. Columns missing from the rows get
+    their Python-side defaults, as with an ORM or Core INSERT.
+
+    Args:
+        db: Database session whose transaction the rows are written in
+        model: Model of the table to write
+        rows: Column values of the rows
+    """
+    if not rows:
+        return
+    if len(rows) < COPY_MIN_ROWS:
+        db.execute(insert(model), rows)
+        return
+    driver = db.get_bind().dialect.driver
+    if driver != 'psycopg2':
+        global _copy_fallback_logged
+        if not _copy_fallback_logged:
+            _copy_fallback_logged = True
+            logger.warning(f"COPY needs the psycopg2 driver, not {driver}; large batches use an executemany INSERT instead")
+        db.execute(insert(model), rows)
+        return
+
+    table = model.__table__
+    columns = list(rows[0])
+    defaults = {column.key: column.default.arg for column in table.columns
+                if column.key not in rows[0] and column.default is not None and (column.default.is_scalar or column.default.is_callable)}
+    columns.extend(defaults)
+
+    # Reshape the rows into columns, format each column, then zip the fields back into lines
+    value_columns = [[row[column] for row in rows] for column in rows[0]]
+    value_columns.extend([_default_value(default) for _ in rows] for default in defaults.values())
+    json_columns = [isinstance(table.c[column].type, JSON) for column in columns]
+    field_columns = [[_copy_value(value, is_json) for value in values] for values, is_json in zip(value_columns, json_columns)]
+
+    buffer = io.StringIO()
+    buffer.writelines(','.join(fields) + '\n' for fields in zip(*field_columns))
+    buffer.seek(0)
+
+    column_list = ', '.join(f'"{table.c[column].name}"' for column in columns)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f'COPY "{table.name}" ({column_list}) FROM STDIN WITH (FORMAT csv)', buffer)
+    finally:
+        cursor.close()
+
+
+def _default_value(default: Any) -> Any:
+    """Evaluate a column default; SQLAlchemy wraps callable defaults to take an execution context."""
+    return default(None) if callable(default) else default
+
+
+def _copy_value(value: Any, is_json: bool = False) -> str:
+    """Format a value as a COPY CSV field; NULL is the only unquoted empty field.
+
+    Args:
+        value: Value to format
+        is_json: Whether the column is JSON; other columns get the value's string
+            form, as they do when the rows are inserted with a statement
+    """
+    if value is None:
+        return ''
+    if is_json:
+        value = json.dumps(value)
+    elif isinstance(value, enum.Enum):
+        # SQLAlchemy Enum columns store member names
+        value = value.name
+    elif isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    return '"' + str(value).replace('"', '""') + '"'
@@ -14,11 +14,24 @@ DB_NAME = os.getenv('DB_NAME', 'keap_db')
 DB_USER = os.getenv('DB_USER', 'postgres')
 DB_PASSWORD = os.getenv('DB_PASSWORD', 'secret')
 
-# Construct database URL
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# Construct database URL; the driver is pinned to psycopg2, which the executemany options
+# below and COPY in bulk_insert depend on
+DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
 
-# Create engine with connection pooling
-engine = create_engine(DATABASE_URL, poolclass=QueuePool, pool_size=5, max_overflow=10, pool_timeout=30, pool_recycle=1800)
+# Connections kept open in the pool, and additional connections opened under load
+DB_POOL_SIZE = 5
+DB_MAX_OVERFLOW = 10
+
+# Rows per multi-VALUES INSERT statement when the ORM or Core inserts many rows
+INSERT_PAGE_SIZE = 1000
+
+# Statements per psycopg2 execute_batch round trip for executemany UPDATEs and DELETEs
+BATCH_PAGE_SIZE = 500
+
+# Create engine with connection pooling; executemany INSERTs use multi-VALUES statements
+# and UPDATEs/DELETEs are sent in batches instead of one round trip per row
+engine = create_engine(DATABASE_URL, poolclass=QueuePool, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=30, pool_recycle=1800, executemany_mode='values_plus_batch',
+                       insertmanyvalues_page_size=INSERT_PAGE_SIZE, executemany_batch_page_size=BATCH_PAGE_SIZE)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -0,0 +1,70 @@
+"""
+Upsert helpers for writing rows without a SELECT before the INSERT or UPDATE.
+
+Rows are written with PostgreSQL INSERT ... ON CONFLICT DO UPDATE, so an
+existing row is updated and a new one inserted in a single statement. The
+update is skipped when none of the written columns changed, so re-syncing
+unchanged data leaves no dead row versions behind.
+"""
+
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import JSON, Text, cast, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+
+def upsert(db: Session, model: Any, mapping: Dict[str, Any], index_elements: Sequence[str] = ('id',)) -> None:
+    """Insert a row, or update the columns in mapping if it already exists.
+
+    Args:
+        db: Database session to execute the statement on
+        model: Model of the table to write
+        mapping: Column values of the row
+        index_elements: Columns of the unique index that identifies the row
+    """
+    upsert_many(db, model, [mapping], index_elements)
+
+
+def upsert_many(db: Session, model: Any, mappings: Iterable[Dict[str, Any]], index_elements: Sequence[str] = ('id',)) -> None:
+    """Insert rows, or update the columns in their mappings where they already exist.
+
+    Mappings with the same columns share one executemany statement, which the
+    engine sends as multi-VALUES INSERTs. Columns missing from a mapping keep
+    their stored value, or get their default when the row is inserted. Rows
+    whose stored values equal the mapping are left untouched.
+
+    Args:
+        db: Database session to execute the statements on
+        model: Model of the table to write
+        mappings: Column values of the rows
+        index_elements: Columns of the unique index that identifies a row
+    """
+    mappings_by_columns: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+    for mapping in mappings:
+        mappings_by_columns.setdefault(tuple(mapping), []).append(mapping)
+
+    for columns, column_mappings in mappings_by_columns.items():
+        stmt = insert(model)
+        update_columns = {column: stmt.excluded[column] for column in columns if column not in index_elements}
+        if update_columns:
+            stmt = stmt.on_conflict_do_update(index_elements=list(index_elements), set_=update_columns, where=_changed(model, stmt, update_columns))
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(index_elements))
+        db.execute(stmt, column_mappings)
+
+
+def _changed(model: Any, stmt: Any, columns: Iterable[str]) -> Any:
+    """Build the condition that any of columns differs from the proposed row.
+
+    JSON has no equality operator in PostgreSQL, so JSON columns are compared
+    as text.
+    """
+    table = model.__table__
+    conditions = []
+    for column in columns:
+        stored, proposed = table.c[column], stmt.excluded[column]
+        if isinstance(stored.type, JSON):
+            stored, proposed = cast(stored, Text), cast(proposed, Text)
+        conditions.append(stored.is_distinct_from(proposed))
+    return or_(*conditions)
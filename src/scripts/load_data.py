@@ -4,7 +4,7 @@ import os
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
 from src.api.keap_client import KeapClient
 from src.database.config import SessionLocal
@@ -163,6 +163,9 @@ class DataLoadManager:
         self.db = SessionLocal()
         self.checkpoint_manager = CheckpointManager()
 
+        # Loaders used for loads by ID, reused so their caches last for the whole run
+        self._loaders: Dict[str, Any] = {}
+
         # Initialize logging
         initialize_loggers()
 
@@ -177,12 +180,18 @@ class DataLoadManager:
         else:
             return self._load_entity_type(entity_type, update)
 
+    def _get_loader(self, entity_type: str) -> Any:
+        """Get the loader for loads by ID of an entity type, creating it on first use."""
+        if entity_type not in self._loaders:
+            from src.scripts.loaders import LoaderFactory
+            self._loaders[entity_type] = LoaderFactory.create_loader(entity_type, self.client, self.db, self.checkpoint_manager)
+        return self._loaders[entity_type]
+
     def _load_single_entity(self, entity_type: str, entity_id: int) -> LoadResult:
         """Load a single entity by ID."""
         start_time = datetime.now(timezone.utc)
         try:
-            from src.scripts.loaders import LoaderFactory
-            loader = LoaderFactory.create_loader(entity_type, self.client, self.db, self.checkpoint_manager)
+            loader = self._get_loader(entity_type)
             success = loader.load_entity_by_id(entity_id)
             result = LoadResult(1, 1 if success else 0, 0 if success else 1)
 
@@ -198,6 +207,27 @@ class DataLoadManager:
             logger.error(f"Error loading {entity_type} {entity_id}: {e}")
             return LoadResult(1, 0, 1)
 
+    def load_entities(self, entity_type: str, entity_ids: Iterable[int]) -> LoadResult:
+        """Load several entities of one type by ID with a single loader."""
+        start_time = datetime.now(timezone.utc)
+        entity_ids = list(entity_ids)
+        try:
+            loader = self._get_loader(entity_type)
+            success_count, failed_count = loader.load_entities_by_ids(entity_ids)
+            result = LoadResult(len(entity_ids), success_count, failed_count)
+
+            # Log audit information
+            end_time = datetime.now(timezone.utc)
+            self.checkpoint_manager.audit_logger.log_audit(entity_type=f"{entity_type}_batch", start_time=start_time, end_time=end_time, total_records=result.total_records, success=result.success_count, failed=result.failed_count)
+
+            return result
+        except Exception as e:
+            end_time = datetime.now(timezone.utc)
+            # Log audit information even for failed operations
+            self.checkpoint_manager.audit_logger.log_audit(entity_type=f"{entity_type}_batch", start_time=start_time, end_time=end_time, total_records=len(entity_ids), success=0, failed=len(entity_ids))
+            logger.error(f"Error loading {len(entity_ids)} {entity_type}: {e}")
+            return LoadResult(len(entity_ids), 0, len(entity_ids))
+
     def _load_entity_type(self, entity_type: str, update: bool) -> LoadResult:
         """Load all entities of a specific type."""
         start_time = datetime.now(timezone.utc)
@@ -7,19 +7,33 @@ code duplication through abstraction and common patterns.
 
 import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
+from sqlalchemy import Integer, column, inspect, select, values
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from src.api.exceptions import KeapQuotaExhaustedError, KeapRateLimitError, KeapServerError
 from src.api.keap_client import KeapClient
+from src.database.upsert import upsert
+from src.models.models import Contact
 from src.utils.global_logger import get_error_logger
+from src.utils.identity_cache import existing_ids_cache
 from src.utils.retry import exponential_backoff
 
 logger = logging.getLogger(__name__)
 
+# The API has no multi-ID filters, so batches are fetched with concurrent get-by-ID calls
+FETCH_WORKERS = 8
+
+# Number of entities loaded by ID between commits when loading a list of IDs
+COMMIT_BATCH_SIZE = 100
+
+# Above this many IDs, PostgreSQL existence checks join a VALUES list instead of using IN
+VALUES_JOIN_MIN_IDS = 1000
+
 
 @dataclass
 class LoadResult:
@@ -42,6 +56,9 @@ class EntityLoader(ABC):
         self.checkpoint_manager = checkpoint_manager
         self.error_logger = get_error_logger()
 
+        # Contact IDs checked by the current page prefetch, for loaders whose entities reference contacts
+        self._page_contact_ids: Set[int] = set()
+
     @property
     @abstractmethod
     def entity_type(self) -> str:
@@ -66,10 +83,51 @@ class EntityLoader(ABC):
         pass
 
     @abstractmethod
-    def load_entity_by_id(self, entity_id: int) -> bool:
-        """Load a single entity by ID."""
+    def load_entity_by_id(self, entity_id: int, commit: bool = True) -> bool:
+        """Load a single entity by ID.
+
+        Args:
+            entity_id: ID of the entity to load
+            commit: Whether to commit the entity; when False it is written in a
+                savepoint and committing is left to the caller
+        """
         pass
 
+    def load_entities_by_ids(self, entity_ids: List[int]) -> Tuple[int, int]:
+        """Load several entities by ID. Override in subclasses that can load a batch at once.
+
+        Entities are committed every COMMIT_BATCH_SIZE entities rather than one by one.
+
+        Returns:
+            Tuple of (success count, failed count)
+        """
+        success_count = 0
+        failed_count = 0
+
+        for start in range(0, len(entity_ids), COMMIT_BATCH_SIZE):
+            batch_success_count = 0
+            try:
+                for entity_id in entity_ids[start:start + COMMIT_BATCH_SIZE]:
+                    try:
+                        if self.load_entity_by_id(entity_id, commit=False):
+                            batch_success_count += 1
+                        else:
+                            failed_count += 1
+                    except Exception as e:
+                        failed_count += 1
+                        logger.error(f"Error loading {self.entity_type} ID {entity_id}: {e}")
+                        self._log_error(self.entity_type, entity_id, e, {f'{self.entity_type}_id': entity_id})
+            finally:
+                try:
+                    self.db.commit()
+                    success_count += batch_success_count
+                except Exception as e:
+                    self.db.rollback()
+                    failed_count += batch_success_count
+                    logger.error(f"Error committing batch of {self.entity_type}: {str(e)}")
+
+        return success_count, failed_count
+
     def get_query_params(self, update: bool = False) -> Dict[str, Any]:
         """Get query parameters for this entity type."""
         if update and self.supports_since_parameter:
@@ -114,70 +172,83 @@ class EntityLoader(ABC):
         """Load entities using pagination.
         
         This method contains the pagination logic that was duplicated
-        across all load functions.
+        across all load functions. The next page is fetched and transformed
+        on a background thread while the current one is processed.
         """
         total_records = 0
         success_count = 0
         failed_count = 0
         api_offset = offset  # Track API pagination offset separately
 
-        while True:
-            items, pagination = self.get_entities(limit=batch_size, offset=api_offset, **query_params)
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{self.entity_type}-prefetch") as prefetch_pool:
+            page_future = prefetch_pool.submit(self.get_entities, limit=batch_size, offset=api_offset, **query_params)
 
-            if not items:
-                logger.info(f"No more {self.entity_type} to load")
-                self.checkpoint_manager.save_checkpoint(self.entity_type, total_records, api_offset, completed=True)
-                break
+            while True:
+                items, pagination = page_future.result()
 
-            # Process items
-            for item in items:
-                total_records += 1
-                try:
-                    logger.info(f"Processing {self.entity_type} ID: {item.id}")
-                    success = self.load_entity_by_id(item.id)
-                    if success:
-                        success_count += 1
-                    else:
-                        failed_count += 1
-                except Exception as e:
-                    failed_count += 1
-                    self._log_item_error(item, e)
-                    continue
+                if not items:
+                    logger.info(f"No more {self.entity_type} to load")
+                    self.checkpoint_manager.save_checkpoint(self.entity_type, total_records, api_offset, completed=True)
+                    break
+
+                next_offset = self.client._parse_next_url(pagination.get('next')) if pagination.get('next') else None
+                if next_offset is not None:
+                    page_future = prefetch_pool.submit(self.get_entities, limit=batch_size, offset=next_offset, **query_params)
+
+                self._prefetch_batch(items)
 
-            # Update checkpoint with total records processed and current API offset
-            self.checkpoint_manager.save_checkpoint(self.entity_type, total_records, api_offset)
+                # Process items
+                page_success, page_failed = self._process_items(items)
+                total_records += len(items)
+                success_count += page_success
+                failed_count += page_failed
 
-            # Check for next page
-            if not pagination.get('next'):
-                logger.info(f"Reached end of {self.entity_type}")
-                self.checkpoint_manager.save_checkpoint(self.entity_type, total_records, api_offset, completed=True)
-                break
+                # Update checkpoint with total records processed and current API offset
+                self.checkpoint_manager.save_checkpoint(self.entity_type, total_records, api_offset)
 
-            next_offset = self.client._parse_next_url(pagination.get('next'))
-            if next_offset is None:
-                logger.info("No more pages to load")
-                self.checkpoint_manager.save_checkpoint(self.entity_type, total_records, api_offset, completed=True)
-                break
+                # Check for next page
+                if not pagination.get('next'):
+                    logger.info(f"Reached end of {self.entity_type}")
+                    self.checkpoint_manager.save_checkpoint(self.entity_type, total_records, api_offset, completed=True)
+                    break
 
-            api_offset = next_offset
+                if next_offset is None:
+                    logger.info("No more pages to load")
+                    self.checkpoint_manager.save_checkpoint(self.entity_type, total_records, api_offset, completed=True)
+                    break
+
+                api_offset = next_offset
 
         logger.info(f"Completed loading {self.entity_type}. Total: {total_records}, Success: {success_count}, Failed: {failed_count}")
         return LoadResult(total_records, success_count, failed_count)
 
     def _load_all_at_once(self, query_params: Dict) -> LoadResult:
         """Load all entities at once (for entities that don't support pagination)."""
-        total_records = 0
-        success_count = 0
-        failed_count = 0
-
         items, _ = self.get_entities(**query_params)
 
         if not items:
             self.checkpoint_manager.save_checkpoint(self.entity_type, 0, 0, completed=True)
             return LoadResult(0, 0, 0)
 
+        self._prefetch_batch(items)
+
+        success_count, failed_count = self._process_items(items)
+        total_records = len(items)
+
+        self.checkpoint_manager.save_checkpoint(self.entity_type, len(items), 0, completed=True)
+        logger.info(f"Completed loading {self.entity_type}. Total: {total_records}, Success: {success_count}, Failed: {failed_count}")
+        return LoadResult(total_records, success_count, failed_count)
+
+    def _process_items(self, items: List) -> Tuple[int, int]:
+        """Load each item of a page by ID.
+
+        Returns:
+            Tuple of (success count, failed count)
+        """
+        success_count = 0
+        failed_count = 0
+
         for item in items:
-            total_records += 1
             try:
                 logger.info(f"Processing {self.entity_type} ID: {item.id}")
                 success = self.load_entity_by_id(item.id)
@@ -190,9 +261,92 @@ class EntityLoader(ABC):
                 self._log_item_error(item, e)
                 continue
 
-        self.checkpoint_manager.save_checkpoint(self.entity_type, len(items), 0, completed=True)
-        logger.info(f"Completed loading {self.entity_type}. Total: {total_records}, Success: {success_count}, Failed: {failed_count}")
-        return LoadResult(total_records, success_count, failed_count)
+        return success_count, failed_count
+
+    def _prefetch_batch(self, items: List) -> None:
+        """Run batched lookups for a page of items before they are processed.
+
+        Subclasses override this to replace per-item existence queries with a
+        single query per page. Failures are logged and the page is processed
+        without the prefetched data. The prefetch only reads, and ending its
+        transaction lets the existing IDs it found be cached before the page
+        is processed.
+        """
+        try:
+            self._prefetch(items)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"Error prefetching {self.entity_type} batch: {str(e)}")
+
+    def _prefetch(self, items: List) -> None:
+        """Prefetch data for a page of items. Override in subclasses."""
+        pass
+
+    def _fetch_existing_ids(self, model: Any, ids: Iterable[int]) -> Set[int]:
+        """Return the subset of ids that already exist in the table for model.
+
+        Large ID sets are joined against a VALUES list on PostgreSQL, which
+        the planner handles better than an IN list with thousands of entries.
+        """
+        ids = {entity_id for entity_id in ids if entity_id}
+        if not ids:
+            return set()
+        if len(ids) >= VALUES_JOIN_MIN_IDS and self.db.get_bind().dialect.name == 'postgresql':
+            id_values = values(column('id', Integer), name='ids').data([(entity_id,) for entity_id in ids])
+            stmt = select(model.id).join(id_values, model.id == id_values.c.id)
+        else:
+            stmt = select(model.id).where(model.id.in_(ids))
+        return set(self.db.execute(stmt).scalars())
+
+    def _existing_ids(self, model: Any, ids: Iterable[int], checked_ids: Iterable[int] = ()) -> Set[int]:
+        """Return the subset of ids that exist, answering from the process-wide cache before querying.
+
+        IDs found by the query are added to the cache once the session commits,
+        as they may be rows written by its own uncommitted transaction.
+
+        Args:
+            model: Model of the table to check
+            ids: IDs to check
+            checked_ids: IDs already checked (e.g. by a page prefetch) that need not be queried again
+
+        Returns:
+            The IDs known or found to exist
+        """
+        ids = set(ids)
+        known_ids = existing_ids_cache.known(model, ids)
+        found_ids = self._fetch_existing_ids(model, ids - known_ids - set(checked_ids))
+        existing_ids_cache.remember_after_commit(self.db, model, found_ids)
+        return known_ids | found_ids
+
+    def _prefetch_contacts(self, items: List, contact_id_attr: Optional[str] = None) -> None:
+        """Check the contacts referenced by a page of items with a single IN query.
+
+        The existing contacts are cached and the checked IDs are kept in
+        _page_contact_ids, so later checks for the page skip the query.
+
+        Args:
+            items: Items of the page, whose contacts relationship is checked
+            contact_id_attr: Name of an attribute holding a single contact ID to check as well
+        """
+        contact_ids = set()
+        for item in items:
+            contact_ids.update(contact.id for contact in getattr(item, 'contacts', None) or [])
+            if contact_id_attr and getattr(item, contact_id_attr, None):
+                contact_ids.add(getattr(item, contact_id_attr))
+
+        self._existing_ids(Contact, contact_ids)
+        self._page_contact_ids = contact_ids
+
+    @staticmethod
+    def _column_values(entity: Any) -> Dict[str, Any]:
+        """Return the mapped column attributes that are set on a model instance.
+
+        Suitable as a mapping for bulk_update_mappings; unset columns are
+        omitted so they are left untouched in the database.
+        """
+        state = entity.__dict__
+        return {attr.key: state[attr.key] for attr in inspect(entity).mapper.column_attrs if attr.key in state}
 
     def _log_item_error(self, item: Any, error: Exception) -> None:
         """Log error for a specific item."""
@@ -212,7 +366,7 @@ class EntityLoader(ABC):
             error_message = error_message.split('\n')[0]
 
         logger.error(f"Error processing {entity_type} {entity_id}: {error_message}")
-        self.error_logger.log_error(entity_type=entity_type, entity_id=entity_id, error_type=error_type, error_message=error_message, additional_data=additional_data)
+        self.error_logger.log_error(entity_type=entity_type, entity_id=entity_id, error_type=error_type, error_message=error_message, additional_data=additional_data, exception=error)
 
     def _get_item_error_data(self, item: Any) -> Dict:
         """Get additional data for error logging. Override in subclasses."""
@@ -263,7 +417,7 @@ class BaseEntityLoader(EntityLoader):
         return method(limit=limit, offset=offset, **kwargs)
 
     @exponential_backoff(max_retries=5, base_delay=1.0, max_delay=60.0, exponential_base=2.0, jitter=True, exceptions=(KeapRateLimitError, KeapServerError))
-    def load_entity_by_id(self, entity_id: int) -> bool:
+    def load_entity_by_id(self, entity_id: int, commit: bool = True) -> bool:
         """Load a single entity by ID using the specified method.
         
         This method provides the common error handling and database operations
@@ -276,12 +430,12 @@ class BaseEntityLoader(EntityLoader):
             full_entity = method(entity_id)
             logger.info(f"Retrieved full {self.entity_type} details for ID: {entity_id}")
 
-            # Handle entity-specific processing
-            self._process_entity(full_entity)
-
-            # Use merge instead of add to handle both inserts and updates
-            self.db.merge(full_entity)
-            self.db.commit()
+            if commit:
+                self._save_entity(full_entity)
+                self.db.commit()
+            else:
+                with self.db.begin_nested():
+                    self._save_entity(full_entity)
 
             logger.info(f"Successfully processed {self.entity_type} ID: {entity_id}")
             return True
@@ -297,11 +451,80 @@ class BaseEntityLoader(EntityLoader):
             return False
         except Exception as e:
             # Other errors are not retryable
-            self.db.rollback()
+            if commit:
+                self.db.rollback()
             logger.error(f"Error processing {self.entity_type} ID {entity_id}: {e}")
             self._log_error(self.entity_type, entity_id, e, {f'{self.entity_type}_id': entity_id})
             return False
 
+    def _save_entity(self, entity: Any) -> None:
+        """Process an entity and merge it with its related rows into the session."""
+        # Handle entity-specific processing
+        self._process_entity(entity)
+
+        if self._has_relationship_state(entity):
+            # Use merge instead of add to handle both inserts and updates, cascading to the related objects
+            self.db.merge(entity)
+        else:
+            # Only columns to write, so a single upsert replaces merge's SELECT and INSERT/UPDATE
+            upsert(self.db, type(entity), self._column_values(entity))
+        self._save_related(entity)
+
+    def _fetch_by_ids(self, entity_ids: Iterable[int]) -> Tuple[List, int]:
+        """Fetch several entities with concurrent calls to the get-by-ID method.
+
+        Returns:
+            Tuple of (fetched entities, failed count)
+        """
+        method = getattr(self.client, self._get_by_id_method)
+        entities = []
+        failed_count = 0
+
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix=f"{self.entity_type}-fetch") as pool:
+            futures = {pool.submit(method, entity_id): entity_id for entity_id in entity_ids}
+            for future in as_completed(futures):
+                entity_id = futures[future]
+                try:
+                    entities.append(future.result())
+                except Exception as e:
+                    failed_count += 1
+                    logger.error(f"Error retrieving {self.entity_type} ID {entity_id}: {e}")
+                    self._log_error(self.entity_type, entity_id, e, {f'{self.entity_type}_id': entity_id})
+
+        return entities, failed_count
+
+    def _merge_each(self, entities: List) -> Tuple[int, int]:
+        """Process, merge and commit entities one at a time, so that one bad entity only fails itself.
+
+        Returns:
+            Tuple of (success count, failed count)
+        """
+        success_count = 0
+        failed_count = 0
+
+        for entity in entities:
+            try:
+                self._save_entity(entity)
+                self.db.commit()
+                success_count += 1
+            except Exception as e:
+                self.db.rollback()
+                failed_count += 1
+                logger.error(f"Error processing {self.entity_type} ID {entity.id}: {e}")
+                self._log_error(self.entity_type, entity.id, e, {f'{self.entity_type}_id': entity.id})
+
+        return success_count, failed_count
+
     def _process_entity(self, entity: Any) -> None:
         """Process entity-specific logic. Override in subclasses for customization."""
         pass
+
+    @staticmethod
+    def _has_relationship_state(entity: Any) -> bool:
+        """Whether any relationship of a model instance is set, so writing it needs merge's cascades."""
+        state = entity.__dict__
+        return any(relationship.key in state for relationship in inspect(entity).mapper.relationships)
+
+    def _save_related(self, entity: Any) -> None:
+        """Write rows kept out of the merged entity, before the commit. Override in subclasses."""
+        pass
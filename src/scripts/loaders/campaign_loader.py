@@ -6,11 +6,12 @@ description, and creation/modification dates that need special handling.
 """
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from src.api.keap_client import KeapClient
+from src.models.models import Campaign
 from .base_loader import BaseEntityLoader
 
 logger = logging.getLogger(__name__)
@@ -30,6 +31,57 @@ class CampaignLoader(BaseEntityLoader):
     def __init__(self, client: KeapClient, db: Session, checkpoint_manager: Any):
         super().__init__(client, db, checkpoint_manager, "campaigns", "get_campaigns", "get_campaign")
 
+    def _process_items(self, items: List) -> Tuple[int, int]:
+        """Load a page of campaigns as one batch."""
+        return self.load_entities_by_ids([item.id for item in items])
+
+    def load_entities_by_ids(self, campaign_ids: List[int]) -> Tuple[int, int]:
+        """Load several campaigns with concurrent API calls and a single commit.
+
+        Existing campaigns and their sequences are loaded with one query up
+        front, so the merges find them in the session instead of selecting
+        each campaign, and new campaigns are inserted without a merge. If the
+        batch cannot be written, each campaign is retried on its own.
+
+        Args:
+            campaign_ids: IDs of the campaigns to load
+            
+        Returns:
+            Tuple of (success count, failed count)
+        """
+        campaigns, failed_count = self._fetch_by_ids(campaign_ids)
+        if not campaigns:
+            return 0, failed_count
+
+        try:
+            # Keep the existing rows referenced while merging so they stay in the identity map
+            existing_campaigns = self.db.query(Campaign).options(selectinload(Campaign.sequences)).filter(Campaign.id.in_([campaign.id for campaign in campaigns])).all()
+            existing_ids = {campaign.id for campaign in existing_campaigns}
+
+            new_campaigns = []
+            with self.db.no_autoflush:
+                for campaign in campaigns:
+                    self._process_entity(campaign)
+                    if campaign.id in existing_ids:
+                        self.db.merge(campaign)
+                    elif campaign.sequences:
+                        self.db.add(campaign)
+                    else:
+                        new_campaigns.append(campaign)
+
+            # New campaigns without sequences have no relationships to cascade, so they are inserted in bulk
+            if new_campaigns:
+                self.db.bulk_save_objects(new_campaigns, return_defaults=False)
+            self.db.commit()
+            logger.info(f"Successfully processed {len(campaigns)} campaigns")
+            return len(campaigns), failed_count
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"Batch save of {len(campaigns)} campaigns failed, retrying one by one: {e}")
+
+        success_count, merge_failed_count = self._merge_each(campaigns)
+        return success_count, failed_count + merge_failed_count
+
     def _process_entity(self, campaign: Any) -> None:
         """Process campaign-specific relationships and attributes.
         
@@ -39,11 +91,11 @@ class CampaignLoader(BaseEntityLoader):
         - Description processing
         - Creation and modification dates
         """
-        # Handle sequence relationships
+        # Handle sequence relationships; the collection is only inspected, never
+        # reassigned, so merging the campaign leaves stored sequences untouched
         if hasattr(campaign, 'sequences'):
             # Process campaign sequences
             self._process_campaign_sequences(campaign.sequences)
-            campaign.sequences = campaign.sequences
 
         # Validate and process campaign attributes
         self._process_campaign_attributes(campaign)
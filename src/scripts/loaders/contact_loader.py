@@ -5,18 +5,28 @@ This loader demonstrates how to handle entities with multiple related
 data types like credit cards, tags, email addresses, etc.
 """
 
+import enum
 import logging
-from typing import Any, Dict
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Set, Tuple
 
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
 from src.api.keap_client import KeapClient
-from src.models.models import Tag
+from src.database.bulk_insert import insert_rows
+from src.models.models import Contact, ContactAddress, ContactCustomFieldValue, EmailAddress, FaxNumber, PhoneNumber, Tag
 from src.transformers.transformers import transform_credit_card
+from src.utils.identity_cache import existing_ids_cache
 from .base_loader import BaseEntityLoader
 
 logger = logging.getLogger(__name__)
 
+# Child collections of a contact that are synced with bulk statements instead of per-row merges,
+# with the column that identifies a child row of a contact (the API does not send child IDs)
+CHILD_COLLECTIONS = {'email_addresses': (EmailAddress, 'field'), 'phone_numbers': (PhoneNumber, 'field'), 'addresses': (ContactAddress, 'field'), 'fax_numbers': (FaxNumber, 'field'),
+                     'custom_field_values': (ContactCustomFieldValue, 'custom_field_id')}
+
 
 class ContactLoader(BaseEntityLoader):
     """Specialized loader for contacts with complex relationships.
@@ -33,6 +43,13 @@ class ContactLoader(BaseEntityLoader):
     def __init__(self, client: KeapClient, db: Session, checkpoint_manager: Any):
         super().__init__(client, db, checkpoint_manager, "contacts", "get_contacts", "get_contact")
 
+        # Child rows detached from contacts by _process_entity, keyed by contact ID and collection name
+        self._pending_children: Dict[int, Dict[str, List[Dict[str, Any]]]] = {}
+
+        # Existing tags referenced by the current batch, and the tag IDs the batch lookup covered
+        self._batch_tags: Dict[int, Tag] = {}
+        self._batch_tag_ids: Set[int] = set()
+
     def _process_entity(self, contact: Any) -> None:
         """Process contact-specific relationships.
         
@@ -49,30 +66,180 @@ class ContactLoader(BaseEntityLoader):
             logger.info(f"Error fetching credit cards for contact {contact.id}: {e}")
             credit_cards = []
 
-        # Get tag IDs and existing tags
+        # Get tag IDs and existing tags, from the batch lookup when it covered them
         tags = contact.tags if hasattr(contact, 'tags') else []
         tag_ids = [tag.id for tag in tags]
-        existing_tags = self.db.query(Tag).filter(Tag.id.in_(tag_ids)).all()
+        if self._batch_tag_ids.issuperset(tag_ids):
+            existing_tags = [self._batch_tags[tag_id] for tag_id in tag_ids if tag_id in self._batch_tags]
+        else:
+            existing_tags = self.db.query(Tag).filter(Tag.id.in_(tag_ids)).all()
 
         # Clear existing credit cards and set new ones
         contact.credit_cards = []
         for credit_card in credit_cards:
             contact.credit_cards.append(credit_card)
 
-        # Set other relationships before merging
-        if hasattr(contact, 'email_addresses'):
-            contact.email_addresses = contact.email_addresses
-        if hasattr(contact, 'phone_numbers'):
-            contact.phone_numbers = contact.phone_numbers
-        if hasattr(contact, 'addresses'):
-            contact.addresses = contact.addresses
         if hasattr(contact, 'tags'):
             # Clear existing tags and set new ones
             contact.tags = []
             for tag in existing_tags:
                 contact.tags.append(tag)
-        if hasattr(contact, 'custom_field_values'):
-            contact.custom_field_values = contact.custom_field_values
+
+        self._detach_children(contact)
+
+    def _detach_children(self, contact: Any) -> None:
+        """Move the child collections of a contact into column mappings for _write_children.
+
+        Unsetting the collections makes merge leave the stored child rows alone,
+        so it does not load, diff and write them one row at a time.
+        """
+        state = contact.__dict__
+        children = {}
+        for key in CHILD_COLLECTIONS:
+            if key not in state:
+                continue
+            rows = []
+            for child in state.pop(key):
+                row = dict(self._column_values(child), contact_id=contact.id)
+                if row.get('id') is None:
+                    # Let the database assign the ID
+                    row.pop('id', None)
+                rows.append(row)
+            children[key] = rows
+        if children:
+            self._pending_children[contact.id] = children
+
+    def _save_related(self, contact: Any) -> None:
+        """Replace the child rows of a merged contact."""
+        self._write_children([contact.id])
+        self._pending_children.pop(contact.id, None)
+
+    def _write_children(self, contact_ids: Iterable[int]) -> None:
+        """Sync the detached child rows of several contacts with their stored rows.
+
+        Each child table is read and written with a handful of statements for
+        all contacts together. Collections that were not part of the API data
+        are left untouched.
+        """
+        rows_by_key: Dict[str, Tuple[List[int], List[Dict[str, Any]]]] = {key: ([], []) for key in CHILD_COLLECTIONS}
+        for contact_id in contact_ids:
+            for key, rows in self._pending_children.get(contact_id, {}).items():
+                rows_by_key[key][0].append(contact_id)
+                rows_by_key[key][1].extend(rows)
+
+        # The contacts must exist before their children reference them
+        self.db.flush()
+
+        for key, (synced_contact_ids, rows) in rows_by_key.items():
+            if synced_contact_ids:
+                model, match_column = CHILD_COLLECTIONS[key]
+                self._sync_children(model, match_column, synced_contact_ids, rows)
+
+    def _sync_children(self, model: Any, match_column: str, contact_ids: List[int], rows: List[Dict[str, Any]]) -> None:
+        """Diff incoming child rows against the stored ones and write only the changes.
+
+        Rows are matched on contact ID and match_column (and their order, should
+        a contact have several rows with the same value). Unchanged rows are
+        skipped, changed rows are updated in place, and unmatched stored rows
+        are deleted.
+
+        Args:
+            model: Model of the child table
+            match_column: Column identifying a child row of a contact
+            contact_ids: IDs of the contacts whose children are synced
+            rows: Incoming column mappings of the children of those contacts
+        """
+        stored_rows = {}
+        occurrences = Counter()
+        for stored_row in self.db.execute(select(model.__table__).where(model.contact_id.in_(contact_ids)).order_by(model.id)).mappings():
+            match = (stored_row['contact_id'], self._plain_value(stored_row[match_column]))
+            stored_rows[match + (occurrences[match],)] = stored_row
+            occurrences[match] += 1
+
+        new_rows = []
+        updated_mappings = []
+        occurrences.clear()
+        for row in rows:
+            match = (row['contact_id'], self._plain_value(row.get(match_column)))
+            stored_row = stored_rows.pop(match + (occurrences[match],), None)
+            occurrences[match] += 1
+
+            if stored_row is None:
+                new_rows.append(row)
+                continue
+            changes = {column: value for column, value in row.items() if column != 'id' and self._plain_value(stored_row[column]) != self._plain_value(value)}
+            if changes:
+                updated_mappings.append(dict(changes, id=stored_row['id']))
+
+        if stored_rows:
+            self.db.execute(delete(model).where(model.id.in_([stored_row['id'] for stored_row in stored_rows.values()])))
+        if updated_mappings:
+            self.db.bulk_update_mappings(model, updated_mappings)
+
+        # Rows with the same columns share one executemany INSERT, or COPY for large batches
+        rows_by_columns: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in new_rows:
+            rows_by_columns.setdefault(tuple(row), []).append(row)
+        for column_rows in rows_by_columns.values():
+            insert_rows(self.db, model, column_rows)
+
+    @staticmethod
+    def _plain_value(value: Any) -> Any:
+        """Return the value of an enum member, so stored enums compare equal to API strings."""
+        return value.value if isinstance(value, enum.Enum) else value
+
+    def _process_items(self, items: List) -> Tuple[int, int]:
+        """Load a page of contacts as one batch."""
+        return self.load_entities_by_ids([item.id for item in items])
+
+    def load_entities_by_ids(self, contact_ids: List[int]) -> Tuple[int, int]:
+        """Load several contacts with concurrent API calls and a single commit.
+
+        The child rows of the whole batch are written with one DELETE and one
+        INSERT per child table. If the batch cannot be written, each contact is
+        retried on its own so that one bad contact does not fail the others.
+
+        Args:
+            contact_ids: IDs of the contacts to load
+
+        Returns:
+            Tuple of (success count, failed count)
+        """
+        contacts, failed_count = self._fetch_by_ids(contact_ids)
+        if not contacts:
+            return 0, failed_count
+
+        try:
+            self._load_batch_tags(contacts)
+            try:
+                for contact in contacts:
+                    self._process_entity(contact)
+                    self.db.merge(contact)
+                self._write_children([contact.id for contact in contacts])
+                self.db.commit()
+                existing_ids_cache.remember(Contact, [contact.id for contact in contacts])
+                logger.info(f"Successfully processed {len(contacts)} contacts")
+                return len(contacts), failed_count
+            except Exception as e:
+                self.db.rollback()
+                logger.warning(f"Batch save of {len(contacts)} contacts failed, retrying one by one: {e}")
+
+            success_count, merge_failed_count = self._merge_each(contacts)
+            return success_count, failed_count + merge_failed_count
+        finally:
+            self._pending_children.clear()
+            self._batch_tags = {}
+            self._batch_tag_ids = set()
+
+    def _load_batch_tags(self, contacts: List) -> None:
+        """Look up the existing tags referenced by a batch of contacts with a single IN query."""
+        tag_ids = {tag.id for contact in contacts for tag in getattr(contact, 'tags', None) or []}
+        try:
+            self._batch_tags = {tag.id: tag for tag in self.db.query(Tag).filter(Tag.id.in_(tag_ids))} if tag_ids else {}
+            self._batch_tag_ids = tag_ids
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"Error looking up tags of contact batch: {str(e)}")
 
     def _get_item_error_data(self, item: Any) -> Dict:
         """Get additional data for error logging specific to contacts."""
@@ -49,17 +49,19 @@ class CustomFieldsLoader(EntityLoader):
         all_custom_fields = self.client.get_all_custom_fields(**kwargs)
         return all_custom_fields, {}
 
-    def load_entity_by_id(self, entity_id: int) -> bool:
+    def load_entity_by_id(self, entity_id: int, commit: bool = True) -> bool:
         """Load a single custom field by ID.
         
         Note: This is not typically used for custom fields as they are
-        loaded in bulk, but it's required by the interface.
+        loaded in bulk, but it's required by the interface. Nothing is
+        written; when commit is False a failed lookup leaves rolling back
+        to the caller, which may hold other entities in the same transaction.
         """
         try:
             logger.info(f"Loading custom field ID: {entity_id}")
 
             # Get the custom field from the database
-            custom_field = self.db.query(CustomField).filter(CustomField.id == entity_id).first()
+            custom_field = self.db.get(CustomField, entity_id)
             if custom_field:
                 logger.info(f"Successfully processed custom field ID: {entity_id}")
                 return True
@@ -68,7 +70,8 @@ class CustomFieldsLoader(EntityLoader):
                 return False
 
         except Exception as e:
-            self.db.rollback()
+            if commit:
+                self.db.rollback()
             logger.error(f"Error processing custom field ID {entity_id}: {e}")
             self._log_error(self.entity_type, entity_id, e, {'custom_field_id': entity_id})
             return False
@@ -100,17 +103,16 @@ class CustomFieldsLoader(EntityLoader):
                         logger.info(f"Processing custom field ID: {field.id}, Name: {field.name}, Type: {field.type}")
 
                         # Check if field already exists
-                        existing_field = self.db.query(CustomField).filter(CustomField.id == field.id).first()
+                        existing_field = self.db.get(CustomField, field.id)
 
                         if existing_field:
                             # Update existing field
                             for key, value in field.__dict__.items():
                                 if not key.startswith('_'):
                                     setattr(existing_field, key, value)
-                            self.db.merge(existing_field)
                         else:
-                            # Add new field
-                            self.db.merge(field)
+                            # Add new field; it is known not to exist, so no merge lookup is needed
+                            self.db.add(field)
 
                         # Commit after each field to maintain atomicity
                         self.db.commit()
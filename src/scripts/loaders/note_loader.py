@@ -6,7 +6,7 @@ body content, and custom field values that need special handling.
 """
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from sqlalchemy.orm import Session
 
@@ -31,6 +31,10 @@ class NoteLoader(BaseEntityLoader):
     def __init__(self, client: KeapClient, db: Session, checkpoint_manager: Any):
         super().__init__(client, db, checkpoint_manager, "notes", "get_notes", "get_note")
 
+    def _prefetch(self, items: List) -> None:
+        """Check the contacts referenced by a page of notes with a single IN query."""
+        self._prefetch_contacts(items, 'contact_id')
+
     def _process_entity(self, note: Any) -> None:
         """Process note-specific relationships and attributes.
         
@@ -69,26 +73,25 @@ class NoteLoader(BaseEntityLoader):
         if not contacts:
             return
 
-        for contact in contacts:
-            try:
-                # Check if contact exists in database
-                existing_contact = self.db.query(Contact).filter(Contact.id == contact.id).first()
-
-                if existing_contact is None:
-                    logger.warning(f"Contact ID {contact.id} referenced by note not found in database")
-                else:
-                    logger.debug(f"Contact ID {contact.id} exists in database")
+        contact_ids = [contact.id for contact in contacts]
+        try:
+            # Check which contacts exist in database, selecting only their IDs
+            existing_ids = self._existing_ids(Contact, contact_ids, self._page_contact_ids)
+        except Exception as e:
+            logger.error(f"Error checking contact IDs {contact_ids}: {str(e)}")
+            return
 
-            except Exception as e:
-                logger.error(f"Error checking contact ID {contact.id}: {str(e)}")
+        for contact_id in contact_ids:
+            if contact_id not in existing_ids:
+                logger.warning(f"Contact ID {contact_id} referenced by note not found in database")
+            else:
+                logger.debug(f"Contact ID {contact_id} exists in database")
 
     def _ensure_primary_contact_exists(self, contact_id: int) -> None:
         """Ensure the primary contact for a note exists in the database."""
         try:
             # Check if primary contact exists in database
-            existing_contact = self.db.query(Contact).filter(Contact.id == contact_id).first()
-
-            if existing_contact is None:
+            if contact_id not in self._existing_ids(Contact, [contact_id], self._page_contact_ids):
                 logger.warning(f"Primary contact ID {contact_id} for note not found in database")
             else:
                 logger.debug(f"Primary contact ID {contact_id} exists in database")
@@ -155,21 +158,20 @@ class NoteLoader(BaseEntityLoader):
         - Link extraction
         - Content validation
         - Text analysis
-        """
-        try:
-            # Basic content analysis
-            if body:
-                # Check for common patterns
-                if '<' in body and '>' in body:
-                    logger.debug("Note body contains HTML-like content")
 
-                if 'http' in body:
-                    logger.debug("Note body contains URLs")
+        Callers are responsible for exception handling; the substring checks
+        below cannot raise on a string.
+        """
+        # Basic content analysis
+        if body:
+            # Check for common patterns
+            if '<' in body and '>' in body:
+                logger.debug("Note body contains HTML-like content")
 
-                # Could add more sophisticated content processing here  # For example: sentiment analysis, keyword extraction, etc.
+            if 'http' in body:
+                logger.debug("Note body contains URLs")
 
-        except Exception as e:
-            logger.warning(f"Error in body content processing: {str(e)}")
+            # Could add more sophisticated content processing here  # For example: sentiment analysis, keyword extraction, etc.
 
     def _get_item_error_data(self, item: Any) -> Dict:
         """Get additional data for error logging specific to notes."""
@@ -6,7 +6,7 @@ that need special handling during the loading process.
 """
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from sqlalchemy.orm import Session
 
@@ -30,6 +30,10 @@ class OpportunityLoader(BaseEntityLoader):
     def __init__(self, client: KeapClient, db: Session, checkpoint_manager: Any):
         super().__init__(client, db, checkpoint_manager, "opportunities", "get_opportunities", "get_opportunity")
 
+    def _prefetch(self, items: List) -> None:
+        """Check the contacts referenced by a page of opportunities with a single IN query."""
+        self._prefetch_contacts(items)
+
     def _process_entity(self, opportunity: Any) -> None:
         """Process opportunity-specific relationships.
         
@@ -63,18 +67,19 @@ class OpportunityLoader(BaseEntityLoader):
         if not contacts:
             return
 
-        for contact in contacts:
-            try:
-                # Check if contact exists in database
-                existing_contact = self.db.query(Contact).filter(Contact.id == contact.id).first()
-
-                if existing_contact is None:
-                    logger.warning(f"Contact ID {contact.id} referenced by opportunity not found in database")
-                else:
-                    logger.debug(f"Contact ID {contact.id} exists in database")
+        contact_ids = [contact.id for contact in contacts]
+        try:
+            # Check which contacts exist in database, selecting only their IDs
+            existing_ids = self._existing_ids(Contact, contact_ids, self._page_contact_ids)
+        except Exception as e:
+            logger.error(f"Error checking contact IDs {contact_ids}: {str(e)}")
+            return
 
-            except Exception as e:
-                logger.error(f"Error checking contact ID {contact.id}: {str(e)}")
+        for contact_id in contact_ids:
+            if contact_id not in existing_ids:
+                logger.warning(f"Contact ID {contact_id} referenced by opportunity not found in database")
+            else:
+                logger.debug(f"Contact ID {contact_id} exists in database")
 
     def _process_stage_information(self, opportunity: Any) -> None:
         """Process and validate stage information.
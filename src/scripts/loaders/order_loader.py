@@ -6,17 +6,41 @@ contacts, and affiliate references that need special handling.
 """
 
 import logging
-from typing import Any, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session, make_transient_to_detached, sessionmaker
 
 from src.api.keap_client import KeapClient
-from src.models.models import Affiliate, PaymentGateway
+from src.database.config import DB_MAX_OVERFLOW, DB_POOL_SIZE
+from src.database.upsert import upsert_many
+from src.models.models import Affiliate, CreditCard, OrderItem, OrderPayment, OrderTransaction, PaymentGateway, PaymentPlan, order_transaction
+from src.transformers.transformers import transform_payment_plan
+from src.utils.identity_cache import existing_ids_cache
 from .affiliate_loader import AffiliateLoader
 from .base_loader import BaseEntityLoader
 
 logger = logging.getLogger(__name__)
 
+# Payments and transactions are independent HTTP round trips, so they are
+# fetched concurrently for each order.
+IO_POOL_WORKERS = 8
+
+# Threads fetching payments and transactions, shared by all order loaders so
+# that discarded loaders do not leave idle threads behind
+_io_pool = ThreadPoolExecutor(max_workers=IO_POOL_WORKERS, thread_name_prefix="order-io")
+
+# Orders of a page are loaded concurrently, each worker thread with its own session
+# and pooled connection; one connection of the pool is left for other sessions
+ORDER_WORKERS = DB_POOL_SIZE + DB_MAX_OVERFLOW - 1
+
+# Existence checks for referenced rows, built once so every lookup reuses the
+# same statement object and hits the compiled-statement cache.
+_EXISTS_STATEMENTS = {model: select(model.id).where(model.id == bindparam('entity_id')) for model in (Affiliate, CreditCard, PaymentGateway)}
+
 
 class OrderLoader(BaseEntityLoader):
     """Specialized loader for orders with complex relationship handling.
@@ -34,6 +58,145 @@ class OrderLoader(BaseEntityLoader):
         super().__init__(client, db, checkpoint_manager, "orders", "get_orders", "get_order")
         self.affiliate_loader = AffiliateLoader(client, db, checkpoint_manager)
 
+        # Sessions are not thread-safe, so each order worker thread gets its own
+        # loader and session, kept for the page and closed once it is loaded
+        self._session_factory = sessionmaker(bind=db.get_bind(), autocommit=False, autoflush=False)
+        self._worker_state = threading.local()
+        self._workers: List['OrderLoader'] = []
+        self._workers_lock = threading.Lock()
+
+        # Referenced rows known to exist are kept in the process-wide existing ID
+        # cache, since the same affiliates and gateways are referenced by many orders
+
+        # IDs checked by the current page prefetch and found missing
+        self._missing_affiliate_ids: Set[int] = set()
+        self._missing_payment_gateway_ids: Set[int] = set()
+        self._missing_credit_card_ids: Set[int] = set()
+
+        # Column values of the existing payment plans of the current page, keyed
+        # by order ID, and the order IDs the page prefetch covered. Plain values
+        # rather than instances, so each worker builds the plan in its own session.
+        self._batch_payment_plans: Dict[int, Dict[str, Any]] = {}
+        self._batch_order_ids: Set[int] = set()
+
+        # Payments and transactions fetched for each order, written with Core
+        # statements once the order itself has been merged
+        self._pending_children: Dict[int, Tuple[Optional[List[Dict[str, Any]]], List[Dict[str, Any]], List[Dict[str, Any]]]] = {}
+
+    def _prefetch(self, orders: List) -> None:
+        """Check which affiliates, payment gateways and credit cards a page of orders references.
+
+        One query per table replaces the per-order existence checks. IDs that
+        are not known here (e.g. payment plans only present on the full order)
+        fall back to a point query in the corresponding _ensure_* method.
+        The column values of the page's existing payment plans are read in one
+        query as well.
+        """
+        affiliate_ids = set()
+        gateway_ids = set()
+        credit_card_ids = set()
+        for order in orders:
+            affiliate_ids.add(getattr(order, 'lead_affiliate_id', None))
+            affiliate_ids.add(getattr(order, 'sales_affiliate_id', None))
+            payment_plan = getattr(order, 'payment_plan', None)
+            if payment_plan is not None:
+                gateway_ids.add(getattr(payment_plan, 'merchant_account_id', None))
+                credit_card_ids.add(getattr(payment_plan, 'credit_card_id', None))
+
+        self._missing_affiliate_ids = self._check_ids(Affiliate, affiliate_ids)
+        self._missing_payment_gateway_ids = self._check_ids(PaymentGateway, gateway_ids)
+        self._missing_credit_card_ids = self._check_ids(CreditCard, credit_card_ids)
+
+        order_ids = [order.id for order in orders]
+        payment_plans = self.db.execute(select(PaymentPlan.__table__).where(PaymentPlan.order_id.in_(order_ids))).mappings()
+        self._batch_payment_plans = {plan['order_id']: dict(plan) for plan in payment_plans}
+        self._batch_order_ids = set(order_ids)
+
+    def _process_items(self, orders: List) -> Tuple[int, int]:
+        """Load the orders of a page concurrently.
+
+        Each order is loaded by a worker thread using its own loader and
+        session; the existing ID cache is shared between workers.
+
+        Returns:
+            Tuple of (success count, failed count)
+        """
+        success_count = 0
+        failed_count = 0
+
+        # End the page session's transaction, so it does not hold a pooled connection while the workers run
+        self.db.commit()
+
+        try:
+            with ThreadPoolExecutor(max_workers=ORDER_WORKERS, thread_name_prefix="order-load") as pool:
+                futures = {pool.submit(self._load_in_worker, order.id): order for order in orders}
+                for future in as_completed(futures):
+                    order = futures[future]
+                    try:
+                        if future.result():
+                            success_count += 1
+                        else:
+                            failed_count += 1
+                    except Exception as e:
+                        failed_count += 1
+                        self._log_item_error(order, e)
+        finally:
+            self._close_workers()
+
+        return success_count, failed_count
+
+    def _load_in_worker(self, order_id: int) -> bool:
+        """Load a single order with the calling thread's own loader and session."""
+        logger.info(f"Processing {self.entity_type} ID: {order_id}")
+        state = self._worker_state
+        if getattr(state, 'worker', None) is None:
+            state.worker = self._create_worker()
+            with self._workers_lock:
+                self._workers.append(state.worker)
+        return state.worker.load_entity_by_id(order_id)
+
+    def _create_worker(self) -> 'OrderLoader':
+        """Create a loader for an order worker thread, with a new session and its own copy of the page prefetch."""
+        worker = OrderLoader(self.client, self._session_factory(), self.checkpoint_manager)
+        # Workers discard IDs from the missing sets as they create rows, so each gets its own copy
+        worker._missing_affiliate_ids = set(self._missing_affiliate_ids)
+        worker._missing_payment_gateway_ids = set(self._missing_payment_gateway_ids)
+        worker._missing_credit_card_ids = set(self._missing_credit_card_ids)
+        worker._batch_payment_plans = self._batch_payment_plans
+        worker._batch_order_ids = self._batch_order_ids
+        return worker
+
+    def _close_workers(self) -> None:
+        """Close the sessions of the page's worker loaders; threads of the next page create new ones."""
+        with self._workers_lock:
+            workers, self._workers = self._workers, []
+        self._worker_state = threading.local()
+        for worker in workers:
+            try:
+                worker.db.close()
+            except Exception as e:
+                logger.warning(f"Error closing order worker session: {str(e)}")
+
+    def _check_ids(self, model: Any, ids: Iterable[int]) -> Set[int]:
+        """Check the positive IDs against the existing ID cache, querying the ones not known to exist.
+
+        Returns:
+            The set of checked IDs that do not exist
+        """
+        ids = {entity_id for entity_id in ids if entity_id and entity_id > 0}
+        return ids - self._existing_ids(model, ids)
+
+    def _row_exists(self, model: Any, entity_id: int, missing_ids: Set[int]) -> bool:
+        """Check whether a row exists, using the existing ID cache and the missing set before querying."""
+        if existing_ids_cache.known(model, [entity_id]):
+            return True
+        if entity_id in missing_ids:
+            return False
+        if self.db.execute(_EXISTS_STATEMENTS[model], {'entity_id': entity_id}).scalar() is not None:
+            existing_ids_cache.remember_after_commit(self.db, model, [entity_id])
+            return True
+        return False
+
     def _process_entity(self, order: Any) -> None:
         """Process order-specific relationships.
         
@@ -50,9 +213,14 @@ class OrderLoader(BaseEntityLoader):
             except Exception as e:
                 logger.warning(f"Error processing payment plan for order {order.id}: {str(e)}")
 
+        # Fetch order payments and transactions concurrently
+        # Payments and transactions are only written with Core statements, so they are fetched as column values
+        payments_future = _io_pool.submit(self.client.get_order_payment_rows, order.id)
+        transactions_future = _io_pool.submit(self.client.get_order_transaction_rows, order.id)
+
         # Get order payments
         try:
-            payments = self.client.get_order_payments(order.id)
+            payments = payments_future.result()
             logger.info(f"Retrieved {len(payments)} payments for order ID: {order.id}")
         except Exception as e:
             logger.warning(f"Error getting payments for order {order.id}: {str(e)}")
@@ -60,39 +228,18 @@ class OrderLoader(BaseEntityLoader):
 
         # Get order transactions
         try:
-            transactions = self.client.get_order_transactions(order.id)
+            transactions = transactions_future.result()
             logger.info(f"Retrieved {len(transactions)} transactions for order ID: {order.id}")
         except Exception as e:
             logger.warning(f"Error getting transactions for order {order.id}: {str(e)}")
             transactions = []
 
-        # Clear and set relationships
-        if hasattr(order, 'payments'):
-            order.payments = []
-            for payment in payments:
-                order.payments.append(payment)
-
-        if hasattr(order, 'transactions'):
-            order.transactions = []
-            for transaction in transactions:
-                order.transactions.append(transaction)
+        # Order items, payments and transactions are written by _save_related after the order is merged
+        self._pending_children[order.id] = (self._detach_items(order), payments, transactions)
 
         if hasattr(order, 'payment_plan') and payment_plan:
             order.payment_plan = payment_plan
 
-        # Handle other relationships
-        if hasattr(order, 'contacts'):
-            order.contacts = order.contacts
-
-        if hasattr(order, 'custom_field_values'):
-            order.custom_field_values = order.custom_field_values
-
-        if hasattr(order, 'items'):
-            order.items = order.items
-
-        if hasattr(order, 'shipping_information'):
-            order.shipping_information = order.shipping_information
-
         # Handle affiliate references
         self._handle_affiliate_references(order)
 
@@ -100,6 +247,78 @@ class OrderLoader(BaseEntityLoader):
         if payment_plan and hasattr(payment_plan, 'credit_card_id'):
             self._handle_credit_card_references(payment_plan)
 
+    def _detach_items(self, order: Any) -> Optional[List[Dict[str, Any]]]:
+        """Move the items of an order into column mappings for _replace_items.
+
+        Unsetting the collection makes merge leave the stored items alone, so
+        it does not load and merge them one row at a time.
+
+        Returns:
+            The item mappings, or None if the order data had no items
+        """
+        items = order.__dict__.pop('items', None)
+        if items is None:
+            return None
+        return [dict(self._column_values(item), order_id=order.id) for item in items]
+
+    def _save_related(self, order: Any) -> None:
+        """Replace the items, payments and transactions of a merged order with Core statements.
+
+        Rows are upserted in one INSERT ... ON CONFLICT statement per table
+        instead of being merged one by one, and rows no longer returned by the
+        API are removed, as assigning the relationships used to do.
+        """
+        if order.id not in self._pending_children:
+            return
+        items, payments, transactions = self._pending_children.pop(order.id)
+
+        # The order row must exist before its children reference it
+        self.db.flush()
+        if items is not None:
+            self._replace_items(order.id, items)
+        self._replace_payments(order.id, payments)
+        self._replace_transactions(order.id, transactions)
+
+    def _replace_items(self, order_id: int, rows: List[Dict[str, Any]]) -> None:
+        """Upsert the items of an order and delete the ones that are gone."""
+        rows = list({row['id']: row for row in rows}.values())
+
+        stale_items = delete(OrderItem).where(OrderItem.order_id == order_id)
+        if rows:
+            stale_items = stale_items.where(OrderItem.id.notin_([row['id'] for row in rows]))
+        self.db.execute(stale_items)
+
+        if rows:
+            upsert_many(self.db, OrderItem, rows)
+
+    def _replace_payments(self, order_id: int, payments: List[Dict[str, Any]]) -> None:
+        """Upsert the payments of an order, given as column values, and delete the ones that are gone."""
+        rows = list({payment['id']: dict(payment, order_id=order_id) for payment in payments}.values())
+
+        stale_payments = delete(OrderPayment).where(OrderPayment.order_id == order_id)
+        if rows:
+            stale_payments = stale_payments.where(OrderPayment.id.notin_([row['id'] for row in rows]))
+        self.db.execute(stale_payments)
+
+        if rows:
+            upsert_many(self.db, OrderPayment, rows)
+
+    def _replace_transactions(self, order_id: int, transactions: List[Dict[str, Any]]) -> None:
+        """Upsert the transactions of an order, given as column values, and relink the order to exactly those transactions."""
+        rows = list({transaction['id']: transaction for transaction in transactions}.values())
+        transaction_ids = [row['id'] for row in rows]
+
+        stale_links = delete(order_transaction).where(order_transaction.c.order_id == order_id)
+        if rows:
+            stale_links = stale_links.where(order_transaction.c.transaction_id.notin_(transaction_ids))
+        self.db.execute(stale_links)
+
+        if rows:
+            upsert_many(self.db, OrderTransaction, rows)
+
+            links = [{'order_id': order_id, 'transaction_id': transaction_id} for transaction_id in transaction_ids]
+            self.db.execute(insert(order_transaction).on_conflict_do_nothing(index_elements=['order_id', 'transaction_id']), links)
+
     def _handle_payment_plan(self, payment_plan_data: Any, order_id: int) -> Any:
         """Handle payment plan data from order API response.
         
@@ -111,11 +330,17 @@ class OrderLoader(BaseEntityLoader):
             PaymentPlan object or None if not found
         """
         try:
-            from src.models.models import PaymentPlan
-            from src.transformers.transformers import transform_payment_plan
-
-            # Check if payment plan exists in database first
-            existing_plan = self.db.query(PaymentPlan).filter(PaymentPlan.order_id == order_id).first()
+            # Check if payment plan exists in database first, using the page prefetch when it covers this order
+            if order_id in self._batch_order_ids:
+                existing_plan = None
+                plan_values = self._batch_payment_plans.get(order_id)
+                if plan_values is not None:
+                    # Build the stored plan from the prefetched values and attach it to this session without a SELECT
+                    existing_plan = PaymentPlan(**plan_values)
+                    make_transient_to_detached(existing_plan)
+                    existing_plan = self.db.merge(existing_plan, load=False)
+            else:
+                existing_plan = self.db.query(PaymentPlan).filter(PaymentPlan.order_id == order_id).first()
 
             if existing_plan:
                 logger.debug(f"Payment plan for order {order_id} already exists in database")
@@ -134,25 +359,21 @@ class OrderLoader(BaseEntityLoader):
                 # Extract payment gateway data from the original data
                 gateway_data = payment_plan_data.get('payment_gateway', {})
             
-            # Handle payment gateway relationship
+            # Handle payment gateway relationship. The gateway is written in a savepoint,
+            # so a failure discards only it and not the caller's transaction.
             if payment_plan.merchant_account_id:
                 try:
-                    self._ensure_payment_gateway_exists(payment_plan.merchant_account_id, gateway_data)
+                    with self.db.begin_nested():
+                        self._ensure_payment_gateway_exists(payment_plan.merchant_account_id, gateway_data)
                 except Exception as gateway_error:
                     logger.error(f"Failed to ensure payment gateway exists for order {order_id}: {str(gateway_error)}")
                     logger.warning(f"Skipping payment plan for order {order_id} due to payment gateway issue")
                     return None
 
-            # Save to database
-            try:
-                merged_plan = self.db.merge(payment_plan)
-                self.db.commit()
-                logger.info(f"Successfully saved payment plan for order {order_id} to database")
-                return merged_plan
-            except Exception as db_error:
-                logger.error(f"Error saving payment plan for order {order_id} to database: {str(db_error)}")
-                self.db.rollback()
-                return None  # Return None if save failed
+            # Merging the order cascades to the plan, so it is written after the order
+            # it references and committed together with it
+            logger.info(f"Prepared payment plan for order {order_id} to be saved with the order")
+            return payment_plan
 
         except Exception as e:
             logger.error(f"Error handling payment plan for order {order_id}: {str(e)}")
@@ -171,32 +392,30 @@ class OrderLoader(BaseEntityLoader):
             gateway_data: The payment gateway data from the API response
         """
         try:
-            from src.models.models import PaymentGateway
-            
-            existing_gateway = self.db.query(PaymentGateway).filter(PaymentGateway.id == gateway_id).first()
-
-            if existing_gateway is None:
+            if not self._row_exists(PaymentGateway, gateway_id, self._missing_payment_gateway_ids):
                 logger.info(f"Payment gateway ID {gateway_id} not found in database, creating from order data")
                 
-                # Create payment gateway from the data in the order response
-                payment_gateway = PaymentGateway(
+                # Create payment gateway from the data in the order response. The insert
+                # is a no-op if another writer created it first, and is committed
+                # together with the order and payment plan that reference it.
+                stmt = insert(PaymentGateway).values(
                     id=gateway_id,
                     name=gateway_data.get('merchant_account_name', f'Gateway {gateway_id}'),
                     type='Unknown',  # Default type since not provided in order data
                     is_active=True,
                     credentials={},
                     settings={}
-                )
+                ).on_conflict_do_nothing(index_elements=['id'])
                 
                 try:
-                    merged_gateway = self.db.merge(payment_gateway)
-                    self.db.commit()
+                    self.db.execute(stmt)
+                    self._missing_payment_gateway_ids.discard(gateway_id)
+                    existing_ids_cache.remember_after_commit(self.db, PaymentGateway, [gateway_id])
                     logger.info(f"Successfully created payment gateway ID {gateway_id} from order data")
                 except Exception as db_error:
                     logger.error(f"Error creating payment gateway ID {gateway_id}: {str(db_error)}")
-                    self.db.rollback()
                     # If we can't create the payment gateway, we should skip this payment plan
-                    # to avoid foreign key constraint violations
+                    # to avoid foreign key constraint violations; the caller's savepoint discards the insert
                     raise
             else:
                 logger.debug(f"Payment gateway ID {gateway_id} already exists in database")
@@ -212,10 +431,7 @@ class OrderLoader(BaseEntityLoader):
         if they don't exist rather than trying to load them here.
         """
         try:
-            from src.models.models import CreditCard
-            existing_card = self.db.query(CreditCard).filter(CreditCard.id == credit_card_id).first()
-
-            if existing_card is None:
+            if not self._row_exists(CreditCard, credit_card_id, self._missing_credit_card_ids):
                 logger.warning(f"Credit card ID {credit_card_id} not found in database. Credit cards should be loaded through the contact loader.")
             else:
                 logger.debug(f"Credit card ID {credit_card_id} already exists in database")
@@ -225,31 +441,25 @@ class OrderLoader(BaseEntityLoader):
 
     def _handle_affiliate_references(self, order: Any) -> None:
         """Handle affiliate references - check if they exist and load if needed."""
-        # Handle lead affiliate
-        if hasattr(order, 'lead_affiliate_id'):
-            if order.lead_affiliate_id == 0:
-                order.lead_affiliate_id = None
-            elif order.lead_affiliate_id and order.lead_affiliate_id > 0:
-                self._ensure_affiliate_exists(order.lead_affiliate_id)
-
-        # Handle sales affiliate
-        if hasattr(order, 'sales_affiliate_id'):
-            if order.sales_affiliate_id == 0:
-                order.sales_affiliate_id = None
-            elif order.sales_affiliate_id and order.sales_affiliate_id > 0:
-                self._ensure_affiliate_exists(order.sales_affiliate_id)
+        for attr in ('lead_affiliate_id', 'sales_affiliate_id'):
+            affiliate_id = getattr(order, attr, None)
+            if affiliate_id == 0:
+                setattr(order, attr, None)
+            elif affiliate_id is not None and affiliate_id > 0:
+                self._ensure_affiliate_exists(affiliate_id)
 
     def _ensure_affiliate_exists(self, affiliate_id: int) -> None:
         """Check if affiliate exists in database, load if it doesn't."""
         try:
-            # Check if affiliate exists in database
-            existing_affiliate = self.db.query(Affiliate).filter(Affiliate.id == affiliate_id).first()
-
-            if existing_affiliate is None:
+            # Check if affiliate exists, using the cached results when available
+            if not self._row_exists(Affiliate, affiliate_id, self._missing_affiliate_ids):
                 logger.info(f"Affiliate ID {affiliate_id} not found in database, loading from API")
-                # Load the affiliate using the affiliate loader
-                success = self.affiliate_loader.load_entity_by_id(affiliate_id)
+                # Load the affiliate using the affiliate loader, in a savepoint of this order's
+                # transaction so it is committed or rolled back together with the order
+                success = self.affiliate_loader.load_entity_by_id(affiliate_id, commit=False)
                 if success:
+                    self._missing_affiliate_ids.discard(affiliate_id)
+                    existing_ids_cache.remember_after_commit(self.db, Affiliate, [affiliate_id])
                     logger.info(f"Successfully loaded affiliate ID {affiliate_id}")
                 else:
                     logger.warning(f"Failed to load affiliate ID {affiliate_id}")
@@ -6,7 +6,7 @@ require special handling for product options and relationships.
 """
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from sqlalchemy.orm import Session
 
@@ -49,15 +49,20 @@ class ProductLoader(BaseEntityLoader):
             logger.debug(f"Error checking existing subscription plan {plan_id}: {str(e)}")
             return None
 
-    def _process_subscription_plan(self, subscription_plan: SubscriptionPlan, product_id: int) -> SubscriptionPlan:
+    def _process_subscription_plan(self, subscription_plan: SubscriptionPlan, product_id: int, updated_mappings: List[Dict[str, Any]]) -> SubscriptionPlan:
         """Process a single subscription plan with proper error handling.
         
+        Nothing is flushed here; the caller flushes once for all plans of a product.
+        
         Args:
             subscription_plan: The subscription plan to process
             product_id: The product ID this plan belongs to
+            updated_mappings: Collects column mappings for existing plans, to be
+                written with a single bulk_update_mappings call
             
         Returns:
-            The merged subscription plan
+            The existing subscription plan, or the new plan to be merged along
+            with the product
             
         Raises:
             Exception: If processing fails
@@ -67,23 +72,17 @@ class ProductLoader(BaseEntityLoader):
 
         if existing_plan:
             logger.debug(f"Subscription plan {subscription_plan.id} already exists, updating...")
-            # Update existing plan with new data
-            for attr, value in subscription_plan.__dict__.items():
-                if not attr.startswith('_') and hasattr(existing_plan, attr):
-                    setattr(existing_plan, attr, value)
-            existing_plan.product_id = product_id
+            # Queue an update of the existing plan with the new data
+            mapping = self._column_values(subscription_plan)
+            mapping['product_id'] = product_id
+            updated_mappings.append(mapping)
             return existing_plan
         else:
             logger.debug(f"Creating new subscription plan {subscription_plan.id}")
-            # Ensure the subscription plan has the correct product_id
+            # Ensure the subscription plan has the correct product_id; merging the
+            # product cascades to its subscription plans, so the plan is not merged here
             subscription_plan.product_id = product_id
-
-            # Process the new subscription plan
-            self.db.flush()  # Flush any pending changes
-            merged_plan = self.db.merge(subscription_plan)
-            self.db.flush()  # Flush the merge operation
-
-            return merged_plan
+            return subscription_plan
 
     def _process_entity(self, product: Any) -> None:
         """Process product-specific relationships.
@@ -114,36 +113,35 @@ class ProductLoader(BaseEntityLoader):
         # Handle subscription plans in separate transactions to avoid duplicate key violations
         if product_subscription_plans:
             # Deduplicate subscription plans by ID to prevent processing duplicates
-            seen_ids = set()
-            unique_plans = []
-            for plan in product_subscription_plans:
-                if plan.id not in seen_ids:
-                    seen_ids.add(plan.id)
-                    unique_plans.append(plan)
+            unique_plans = list({plan.id: plan for plan in product_subscription_plans}.values())
 
             logger.info(f"Processing {len(unique_plans)} unique subscription plans for product {product.id} (from {len(product_subscription_plans)} total)")
 
             successful_plans = 0
+            updated_mappings = []
             for subscription_plan in unique_plans:
                 try:
-                    # Process the subscription plan using the helper method
-                    merged_plan = self._process_subscription_plan(subscription_plan, product.id)
+                    # Process the subscription plan using the helper method, in a savepoint so a
+                    # failed lookup does not abort the transaction the product is written in
+                    with self.db.begin_nested():
+                        plan = self._process_subscription_plan(subscription_plan, product.id, updated_mappings)
 
-                    # Add the merged plan to the product's subscription_plans list
-                    product.subscription_plans.append(merged_plan)
+                    # Add the plan to the product's subscription_plans list
+                    product.subscription_plans.append(plan)
                     successful_plans += 1
 
                     logger.debug(f"Successfully processed subscription plan {subscription_plan.id} for product {product.id}")
 
                 except Exception as e:
+                    # The savepoint has been rolled back; earlier plans and entities are kept
                     logger.warning(f"Error processing subscription plan {subscription_plan.id} for product {product.id}: {str(e)}")
-                    # Rollback this specific subscription plan operation
-                    try:
-                        self.db.rollback()
-                    except Exception as rollback_error:
-                        logger.error(f"Error during rollback for subscription plan {subscription_plan.id}: {str(rollback_error)}")
                     continue
 
+            # Write all plan updates and inserts for this product at once
+            if updated_mappings:
+                self.db.bulk_update_mappings(SubscriptionPlan, updated_mappings)
+            self.db.flush()
+
             logger.info(f"Successfully processed {successful_plans}/{len(unique_plans)} subscription plans for product {product.id}")
 
     def _get_item_error_data(self, item: Any) -> Dict:
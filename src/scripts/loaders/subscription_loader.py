@@ -8,11 +8,13 @@ get_subscriptions call only.
 """
 
 import logging
-from typing import Any, Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
 from src.api.keap_client import KeapClient
+from src.database.upsert import upsert_many
 from src.models.models import Subscription
 from .base_loader import EntityLoader
 
@@ -23,7 +25,7 @@ class SubscriptionLoader(EntityLoader):
     """Specialized loader for subscriptions.
     
     Subscriptions are unique because:
-    1. They don't have a get_subscription method for individual retrieval
+    1. They don't have a get_subscription method, so single loads use an index of all subscriptions
     2. They should be modeled from the get_subscriptions call only
     3. They support pagination and the 'since' parameter
     4. They have relationships with contacts, products, and subscription plans
@@ -32,6 +34,9 @@ class SubscriptionLoader(EntityLoader):
     def __init__(self, client: KeapClient, db: Session, checkpoint_manager: Any):
         super().__init__(client, db, checkpoint_manager)
 
+        # All subscriptions keyed by ID, fetched on the first single-subscription load
+        self._subscriptions_by_id: Optional[Dict[int, Subscription]] = None
+
     @property
     def entity_type(self) -> str:
         return "subscriptions"
@@ -57,14 +62,53 @@ class SubscriptionLoader(EntityLoader):
 
         return self.client.get_subscriptions(limit=limit, offset=offset, **kwargs)
 
-    def load_entity_by_id(self, entity_id: int) -> bool:
+    def load_entity_by_id(self, entity_id: int, commit: bool = True) -> bool:
         """Load a single subscription by ID.
         
-        Since there's no get_subscription method, this method is not used
-        for subscriptions. All subscription data comes from get_subscriptions.
+        Since there's no get_subscription method, the subscription is looked
+        up in an index of all subscriptions that is fetched once per loader,
+        so loading several subscriptions costs a single pass over the list.
         """
-        logger.warning(f"load_entity_by_id called for subscription {entity_id}, but subscriptions don't support individual retrieval")
-        return False
+        try:
+            subscription = self._get_subscriptions_by_id().get(entity_id)
+            if subscription is None:
+                logger.warning(f"Subscription {entity_id} not found in get_subscriptions results")
+                return False
+
+            if commit:
+                self._process_subscription(subscription)
+                self.db.commit()
+            else:
+                with self.db.begin_nested():
+                    self._process_subscription(subscription)
+            logger.info(f"Successfully processed {self.entity_type} ID: {entity_id}")
+            return True
+
+        except Exception as e:
+            if commit:
+                self.db.rollback()
+            logger.error(f"Error processing {self.entity_type} ID {entity_id}: {e}")
+            self._log_error(self.entity_type, entity_id, e, {f'{self.entity_type}_id': entity_id})
+            return False
+
+    def _get_subscriptions_by_id(self, batch_size: int = 50) -> Dict[int, Subscription]:
+        """Fetch all subscriptions once and index them by ID."""
+        if self._subscriptions_by_id is None:
+            subscriptions_by_id = {}
+            api_offset = 0
+            while True:
+                subscriptions, pagination = self.get_entities(limit=batch_size, offset=api_offset)
+                subscriptions_by_id.update((subscription.id, subscription) for subscription in subscriptions)
+
+                next_offset = self.client._parse_next_url(pagination.get('next')) if subscriptions and pagination.get('next') else None
+                if next_offset is None:
+                    break
+                api_offset = next_offset
+
+            logger.info(f"Indexed {len(subscriptions_by_id)} {self.entity_type} for lookups by ID")
+            self._subscriptions_by_id = subscriptions_by_id
+
+        return self._subscriptions_by_id
 
     def load_all(self, batch_size: int = 50, update: bool = False) -> Any:
         """Load all subscriptions.
@@ -98,65 +142,118 @@ class SubscriptionLoader(EntityLoader):
         failed_count = 0
         api_offset = offset  # Track API pagination offset separately
 
-        while True:
-            subscriptions, pagination = self.get_entities(limit=batch_size, offset=api_offset, **query_params)
+        # The next page is fetched on a background thread while the current one is written
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="subscription-prefetch") as prefetch_pool:
+            page_future = prefetch_pool.submit(self.get_entities, limit=batch_size, offset=api_offset, **query_params)
 
-            if not subscriptions:
-                logger.info(f"No more {self.entity_type} to load")
-                self.checkpoint_manager.save_checkpoint(self.entity_type, total_records, api_offset, completed=True)
-                break
+            while True:
+                subscriptions, pagination = page_future.result()
 
-            # Process all subscriptions from this batch
-            for subscription in subscriptions:
-                total_records += 1
-                try:
-                    logger.info(f"Processing {self.entity_type} ID: {subscription.id}")
+                if not subscriptions:
+                    logger.info(f"No more {self.entity_type} to load")
+                    self.checkpoint_manager.save_checkpoint(self.entity_type, total_records, api_offset, completed=True)
+                    break
 
-                    # Since we already have the full subscription data from get_subscriptions,
-                    # we can directly merge it into the database
-                    self._process_subscription(subscription)
+                next_offset = self.client._parse_next_url(pagination.get('next')) if pagination.get('next') else None
+                if next_offset is not None:
+                    page_future = prefetch_pool.submit(self.get_entities, limit=batch_size, offset=next_offset, **query_params)
+
+                total_records += len(subscriptions)
 
-                    success_count += 1
-                    logger.info(f"Successfully processed {self.entity_type} ID: {subscription.id}")
+                # Write the page with bulk statements, falling back to per-row
+                # merges so that a single bad row only fails itself
+                if self._bulk_save_subscriptions(subscriptions):
+                    page_success_count = len(subscriptions)
+                else:
+                    page_success_count = self._merge_subscriptions(subscriptions)
+                failed_count += len(subscriptions) - page_success_count
 
+                # Commit the whole page in a single transaction
+                try:
+                    self.db.commit()
+                    success_count += page_success_count
                 except Exception as e:
-                    failed_count += 1
-                    self._log_item_error(subscription, e)
-                    continue
+                    self.db.rollback()
+                    failed_count += page_success_count
+                    logger.error(f"Error committing {self.entity_type} page at offset {api_offset}: {e}")
+                    self._log_operation_error(e)
 
-            # Update checkpoint with total records processed and current API offset
-            self.checkpoint_manager.save_checkpoint(self.entity_type, total_records, api_offset)
+                # Update checkpoint with total records processed and current API offset
+                self.checkpoint_manager.save_checkpoint(self.entity_type, total_records, api_offset)
 
-            # Check for next page
-            if not pagination.get('next'):
-                logger.info(f"Reached end of {self.entity_type}")
-                self.checkpoint_manager.save_checkpoint(self.entity_type, total_records, api_offset, completed=True)
-                break
+                # Check for next page
+                if not pagination.get('next'):
+                    logger.info(f"Reached end of {self.entity_type}")
+                    self.checkpoint_manager.save_checkpoint(self.entity_type, total_records, api_offset, completed=True)
+                    break
 
-            next_offset = self.client._parse_next_url(pagination.get('next'))
-            if next_offset is None:
-                logger.info("No more pages to load")
-                self.checkpoint_manager.save_checkpoint(self.entity_type, total_records, api_offset, completed=True)
-                break
+                if next_offset is None:
+                    logger.info("No more pages to load")
+                    self.checkpoint_manager.save_checkpoint(self.entity_type, total_records, api_offset, completed=True)
+                    break
 
-            api_offset = next_offset
+                api_offset = next_offset
 
         logger.info(f"Completed loading {self.entity_type}. Total: {total_records}, Success: {success_count}, Failed: {failed_count}")
         return LoadResult(total_records, success_count, failed_count)
 
+    def _bulk_save_subscriptions(self, subscriptions: List[Subscription]) -> bool:
+        """Insert new and update existing subscriptions of a page with upserts.
+
+        No SELECT is issued to find existing rows. Runs inside a savepoint that
+        is rolled back on failure.
+
+        Returns:
+            True if the page was written, False if the caller should fall back to per-row merges
+        """
+        # Keep the last occurrence of each ID, as successive merges would
+        unique_subscriptions = {subscription.id: subscription for subscription in subscriptions}
+        try:
+            with self.db.begin_nested():
+                upsert_many(self.db, Subscription, [self._column_values(subscription) for subscription in unique_subscriptions.values()])
+
+            logger.info(f"Bulk saved {len(unique_subscriptions)} {self.entity_type}")
+            return True
+
+        except Exception as e:
+            logger.warning(f"Bulk save of {self.entity_type} page failed, retrying row by row: {e}")
+            return False
+
+    def _merge_subscriptions(self, subscriptions: List[Subscription]) -> int:
+        """Merge subscriptions one at a time, each in its own savepoint.
+
+        Returns:
+            The number of subscriptions merged successfully
+        """
+        success_count = 0
+        for subscription in subscriptions:
+            try:
+                logger.info(f"Processing {self.entity_type} ID: {subscription.id}")
+
+                with self.db.begin_nested():
+                    self._process_subscription(subscription)
+
+                success_count += 1
+                logger.info(f"Successfully processed {self.entity_type} ID: {subscription.id}")
+
+            except Exception as e:
+                self._log_item_error(subscription, e)
+                continue
+
+        return success_count
+
     def _process_subscription(self, subscription: Subscription) -> None:
         """Process a single subscription.
         
         Since we get full subscription data from get_subscriptions, we can
         directly merge it into the database without additional API calls.
+        The caller owns the transaction and commits once per page.
         """
         try:
             # Use merge instead of add to handle both inserts and updates
             self.db.merge(subscription)
-            self.db.commit()
 
         except Exception as e:
-            self.db.rollback()
             logger.error(f"Error processing subscription {subscription.id}: {e}")
             raise
 
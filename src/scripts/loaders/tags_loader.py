@@ -6,14 +6,16 @@ from API response to model instances.
 """
 
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 
 from sqlalchemy.orm import Session
 
 from src.api.exceptions import KeapQuotaExhaustedError, KeapRateLimitError, KeapServerError
 from src.api.keap_client import KeapClient
-from src.models.models import TagCategory
+from src.database.upsert import upsert_many
+from src.models.models import Tag, TagCategory
 from src.transformers.transformers import transform_tag
+from src.utils.identity_cache import existing_ids_cache
 from src.utils.retry import exponential_backoff
 from .base_loader import BaseEntityLoader
 
@@ -41,18 +43,17 @@ class TagsLoader(BaseEntityLoader):
         # Handle tag category if present
         if hasattr(tag, 'category_id') and tag.category_id:
             try:
-                # Check if category exists
-                existing_category = self.db.query(TagCategory).filter_by(id=tag.category_id).first()
-                if not existing_category:
+                # Check if category exists, answering from the cache of known IDs when possible
+                if tag.category_id not in self._existing_ids(TagCategory, [tag.category_id]):
                     # Create new category
                     category = TagCategory(id=tag.category_id, name=tag.category.name if hasattr(tag, 'category') else '')
-                    self.db.merge(category)
+                    self.db.add(category)
                     self.db.flush()
             except Exception as e:
                 logger.warning(f"Error handling tag category for tag {tag.id}: {str(e)}")  # Continue processing the tag even if category handling fails
 
     @exponential_backoff(max_retries=5, base_delay=1.0, max_delay=60.0, exponential_base=2.0, jitter=True, exceptions=(KeapRateLimitError, KeapServerError))
-    def load_entity_by_id(self, entity_id: int) -> bool:
+    def load_entity_by_id(self, entity_id: int, commit: bool = True) -> bool:
         """Load a single tag by ID with transformation."""
         try:
             logger.info(f"Loading tag ID: {entity_id}")
@@ -71,12 +72,12 @@ class TagsLoader(BaseEntityLoader):
                 logger.warning(f"Failed to transform tag ID {entity_id}")
                 return False
 
-            # Handle entity-specific processing
-            self._process_entity(tag)
-
-            # Use merge instead of add to handle both inserts and updates
-            self.db.merge(tag)
-            self.db.commit()
+            if commit:
+                self._save_entity(tag)
+                self.db.commit()
+            else:
+                with self.db.begin_nested():
+                    self._save_entity(tag)
 
             logger.info(f"Successfully processed tag ID: {entity_id}")
             return True
@@ -92,11 +93,72 @@ class TagsLoader(BaseEntityLoader):
             return False
         except Exception as e:
             # Other errors are not retryable
-            self.db.rollback()
+            if commit:
+                self.db.rollback()
             logger.error(f"Error processing tag ID {entity_id}: {e}")
             self._log_error(self.entity_type, entity_id, e, {'tag_id': entity_id})
             return False
 
+    def _process_items(self, items: List) -> Tuple[int, int]:
+        """Load a page of tags as one batch."""
+        return self.load_entities_by_ids([item.id for item in items])
+
+    def load_entities_by_ids(self, tag_ids: List[int]) -> Tuple[int, int]:
+        """Load several tags with concurrent API calls and a single commit.
+
+        If the batch cannot be written, each tag is retried on its own so that
+        one bad tag does not fail the others.
+
+        Args:
+            tag_ids: IDs of the tags to load
+            
+        Returns:
+            Tuple of (success count, failed count)
+        """
+        fetched_tags, failed_count = self._fetch_by_ids(tag_ids)
+
+        tags = []
+        for tag_data in fetched_tags:
+            tag = transform_tag(tag_data) if isinstance(tag_data, dict) else tag_data
+            if not tag:
+                logger.warning("Failed to transform fetched tag")
+                failed_count += 1
+                continue
+            tags.append(tag)
+
+        if not tags:
+            return 0, failed_count
+
+        try:
+            self._save_tags(tags)
+            self.db.commit()
+            existing_ids_cache.remember(TagCategory, {tag.category_id for tag in tags if tag.category_id})
+            logger.info(f"Successfully processed {len(tags)} tags")
+            return len(tags), failed_count
+        except Exception as e:
+            self.db.rollback()
+            logger.warning(f"Batch save of {len(tags)} tags failed, retrying one by one: {e}")
+
+        success_count, merge_failed_count = self._merge_each(tags)
+        return success_count, failed_count + merge_failed_count
+
+    def _save_tags(self, tags: List[Tag]) -> None:
+        """Write tags and their missing categories with bulk statements.
+
+        Categories not already known to exist are checked with a single IN
+        query; tags are upserted.
+        """
+        categories = {tag.category_id: getattr(tag, 'category', None) for tag in tags if tag.category_id}
+        existing_category_ids = self._existing_ids(TagCategory, categories)
+        for category_id, category in categories.items():
+            if category_id not in existing_category_ids:
+                self.db.add(TagCategory(id=category_id, name=category.name if category is not None else ''))
+        self.db.flush()
+
+        # Keep the last occurrence of each ID, as successive merges would
+        unique_tags = {tag.id: tag for tag in tags}
+        upsert_many(self.db, Tag, [self._column_values(tag) for tag in unique_tags.values()])
+
     def _get_item_error_data(self, item: Any) -> Dict:
         """Get additional data for error logging specific to tags."""
         return {'name': getattr(item, 'name', None), 'category_id': getattr(item, 'category_id', None)}
@@ -6,7 +6,8 @@ status, due dates, and completion dates that need special handling.
 """
 
 import logging
-from typing import Any, Dict
+from operator import attrgetter
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
@@ -16,6 +17,10 @@ from .base_loader import BaseEntityLoader
 
 logger = logging.getLogger(__name__)
 
+# Task attributes included in error log data, read together with a single getter
+TASK_ERROR_FIELDS = ('title', 'status', 'priority', 'type', 'due_date', 'completed_date', 'contact_id', 'created_at', 'modified_at')
+_get_task_error_values = attrgetter(*TASK_ERROR_FIELDS)
+
 
 class TaskLoader(BaseEntityLoader):
     """Specialized loader for tasks with relationship handling.
@@ -31,6 +36,10 @@ class TaskLoader(BaseEntityLoader):
     def __init__(self, client: KeapClient, db: Session, checkpoint_manager: Any):
         super().__init__(client, db, checkpoint_manager, "tasks", "get_tasks", "get_task")
 
+    def _prefetch(self, tasks: List) -> None:
+        """Check the contacts referenced by a page of tasks with a single IN query."""
+        self._prefetch_contacts(tasks, 'contact_id')
+
     def _process_entity(self, task: Any) -> None:
         """Process task-specific relationships and attributes.
         
@@ -40,15 +49,8 @@ class TaskLoader(BaseEntityLoader):
         - Due date and completion date processing
         - Task type and notes handling
         """
-        # Handle contact relationships
-        if hasattr(task, 'contacts'):
-            # Ensure all referenced contacts exist in the database
-            self._ensure_contacts_exist(task.contacts)
-            task.contacts = task.contacts
-
-        # Handle primary contact relationship
-        if hasattr(task, 'contact_id') and task.contact_id:
-            self._ensure_primary_contact_exists(task.contact_id)
+        # Ensure all referenced contacts, including the primary contact, exist in the database
+        self._ensure_contacts_exist(getattr(task, 'contacts', None), getattr(task, 'contact_id', None))
 
         # Validate and process task attributes
         self._process_task_attributes(task)
@@ -56,41 +58,35 @@ class TaskLoader(BaseEntityLoader):
         # Handle task type and notes
         self._process_task_content(task)
 
-    def _ensure_contacts_exist(self, contacts: list) -> None:
+    def _ensure_contacts_exist(self, contacts: list, primary_contact_id: Optional[int] = None) -> None:
         """Ensure all referenced contacts exist in the database.
         
-        This method checks if the contacts associated with a task
-        exist in the database and logs warnings for any missing contacts.
+        The contacts associated with a task and its primary contact are
+        looked up in the process-wide cache filled by the page prefetch; any
+        not covered by it are checked with a single IN query. Warnings are logged
+        for missing contacts.
+        
+        Args:
+            contacts: Contacts associated with the task
+            primary_contact_id: ID of the task's primary contact, if any
         """
-        if not contacts:
+        contact_ids = {contact.id for contact in contacts or []}
+        if primary_contact_id:
+            contact_ids.add(primary_contact_id)
+        if not contact_ids:
             return
 
-        for contact in contacts:
-            try:
-                # Check if contact exists in database
-                existing_contact = self.db.query(Contact).filter(Contact.id == contact.id).first()
-
-                if existing_contact is None:
-                    logger.warning(f"Contact ID {contact.id} referenced by task not found in database")
-                else:
-                    logger.debug(f"Contact ID {contact.id} exists in database")
-
-            except Exception as e:
-                logger.error(f"Error checking contact ID {contact.id}: {str(e)}")
-
-    def _ensure_primary_contact_exists(self, contact_id: int) -> None:
-        """Ensure the primary contact for a task exists in the database."""
         try:
-            # Check if primary contact exists in database
-            existing_contact = self.db.query(Contact).filter(Contact.id == contact_id).first()
+            existing_ids = self._existing_ids(Contact, contact_ids, self._page_contact_ids)
+        except Exception as e:
+            logger.error(f"Error checking contact IDs {sorted(contact_ids)}: {str(e)}")
+            return
 
-            if existing_contact is None:
+        for contact_id in contact_ids - existing_ids:
+            if contact_id == primary_contact_id:
                 logger.warning(f"Primary contact ID {contact_id} for task not found in database")
             else:
-                logger.debug(f"Primary contact ID {contact_id} exists in database")
-
-        except Exception as e:
-            logger.error(f"Error checking primary contact ID {contact_id}: {str(e)}")
+                logger.warning(f"Contact ID {contact_id} referenced by task not found in database")
 
     def _process_task_attributes(self, task: Any) -> None:
         """Process and validate task-specific attributes.
@@ -98,54 +94,60 @@ class TaskLoader(BaseEntityLoader):
         This method handles priority, status, due dates, and completion dates
         with appropriate validation and logging.
         """
-        # Log priority information
-        if hasattr(task, 'priority') and task.priority:
-            logger.debug(f"Processing task {task.id} with priority: {task.priority}")
-
-        # Log status information
-        if hasattr(task, 'status') and task.status:
-            logger.debug(f"Processing task {task.id} with status: {task.status}")
-
-        # Process due date
-        if hasattr(task, 'due_date') and task.due_date:
-            try:
-                logger.debug(f"Task {task.id} has due date: {task.due_date}")  # Could add validation here (e.g., ensure due date is in the future for pending tasks)
-            except Exception as e:
-                logger.warning(f"Error processing due date for task {task.id}: {str(e)}")
-
-        # Process completion date
-        if hasattr(task, 'completed_date') and task.completed_date:
-            try:
-                logger.debug(f"Task {task.id} was completed on: {task.completed_date}")  # Could add validation here (e.g., ensure completion date is after creation date)
-            except Exception as e:
-                logger.warning(f"Error processing completion date for task {task.id}: {str(e)}")
+        # The attributes are only logged, so skip reading and formatting them unless debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            # Log priority information
+            priority = getattr(task, 'priority', None)
+            if priority:
+                logger.debug("Processing task %s with priority: %s", task.id, priority)
+
+            # Log status information
+            status = getattr(task, 'status', None)
+            if status:
+                logger.debug("Processing task %s with status: %s", task.id, status)
+
+            # Process due date
+            due_date = getattr(task, 'due_date', None)
+            if due_date:
+                logger.debug("Task %s has due date: %s", task.id, due_date)  # Could add validation here (e.g., ensure due date is in the future for pending tasks)
+
+            # Process completion date
+            completed_date = getattr(task, 'completed_date', None)
+            if completed_date:
+                logger.debug("Task %s was completed on: %s", task.id, completed_date)  # Could add validation here (e.g., ensure completion date is after creation date)
 
         # Validate status and completion date consistency
         self._validate_status_consistency(task)
 
     def _validate_status_consistency(self, task: Any) -> None:
-        """Validate consistency between task status and completion date."""
-        try:
-            if hasattr(task, 'status') and hasattr(task, 'completed_date'):
-                if task.status == 'COMPLETED' and not task.completed_date:
-                    logger.warning(f"Task {task.id} has COMPLETED status but no completion date")
-                elif task.status != 'COMPLETED' and task.completed_date:
-                    logger.warning(f"Task {task.id} has completion date but status is {task.status}")
-        except Exception as e:
-            logger.warning(f"Error validating status consistency for task {task.id}: {str(e)}")
+        """Validate consistency between task status and completion date.
+
+        Only compares the two attributes, so no exception handling is needed.
+        """
+        status = getattr(task, 'status', None)
+        completed_date = getattr(task, 'completed_date', None)
+        if status == 'COMPLETED' and not completed_date:
+            logger.warning(f"Task {task.id} has COMPLETED status but no completion date")
+        elif status and status != 'COMPLETED' and completed_date:
+            logger.warning(f"Task {task.id} has completion date but status is {status}")
 
     def _process_task_content(self, task: Any) -> None:
         """Process task content like type and notes."""
+        # Type and notes are only logged, so skip the work unless debug logging is on
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+
         # Log task type
-        if hasattr(task, 'type') and task.type:
-            logger.debug(f"Task {task.id} is of type: {task.type}")
+        task_type = getattr(task, 'type', None)
+        if task_type:
+            logger.debug("Task %s is of type: %s", task.id, task_type)
 
         # Process task notes
-        if hasattr(task, 'notes') and task.notes:
+        notes = getattr(task, 'notes', None)
+        if notes:
             try:
                 # Log note length for debugging
-                note_length = len(task.notes) if task.notes else 0
-                logger.debug(f"Task {task.id} has notes with {note_length} characters")
+                logger.debug("Task %s has notes with %d characters", task.id, len(notes))
 
                 # Could add content validation here (e.g., check for required fields)
             except Exception as e:
@@ -153,6 +155,9 @@ class TaskLoader(BaseEntityLoader):
 
     def _get_item_error_data(self, item: Any) -> Dict:
         """Get additional data for error logging specific to tasks."""
-        return {'id': item.id, 'title': getattr(item, 'title', None), 'status': getattr(item, 'status', None), 'priority': getattr(item, 'priority', None), 'type': getattr(item, 'type', None),
-                'due_date': getattr(item, 'due_date', None), 'completed_date': getattr(item, 'completed_date', None), 'contact_id': getattr(item, 'contact_id', None),
-                'created_at': getattr(item, 'created_at', None), 'modified_at': getattr(item, 'modified_at', None)}
+        try:
+            values = _get_task_error_values(item)
+        except AttributeError:
+            # Not a Task model; read whatever attributes the item has
+            values = tuple(getattr(item, field, None) for field in TASK_ERROR_FIELDS)
+        return {'id': item.id, **dict(zip(TASK_ERROR_FIELDS, values))}
@@ -7,16 +7,21 @@ entities that failed due to missing dependencies (like foreign key violations).
 """
 
 import glob
-import json
 import logging
 import os
 import re
+import threading
 from collections import defaultdict
-from typing import Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+import ijson
 
 from src.api.keap_client import KeapClient
 from src.database.config import SessionLocal
 from src.scripts.load_data import DataLoadManager
+from src.scripts.loaders import LoaderFactory
+from src.scripts.loaders.base_loader import COMMIT_BATCH_SIZE
 from src.utils.global_logger import initialize_loggers
 from src.utils.logging_config import setup_logging
 
@@ -24,6 +29,27 @@ from src.utils.logging_config import setup_logging
 setup_logging(log_level=logging.INFO, log_dir="logs", app_name="keap_data_extract")
 logger = logging.getLogger(__name__)
 
+# Foreign key violation pattern, e.g.: Key (contact_id)=(1813) is not present in table "contacts"
+FK_VIOLATION_PATTERN = re.compile(r'Key \((\w+)\)=\((\d+)\) is not present in table "(\w+)"')
+
+# Map table names to entity types
+TABLE_TO_ENTITY = {'contacts': 'contacts', 'products': 'products', 'affiliates': 'affiliates', 'orders': 'orders', 'opportunities': 'opportunities', 'tasks': 'tasks', 'notes': 'notes',
+                   'campaigns': 'campaigns', }
+
+# Order in which missing dependencies are reprocessed (entities that should be loaded first come first)
+ENTITY_PRIORITY = {'products': 0,  # Load products first (subscription plans depend on them)
+                   'contacts': 1,  # Load contacts (many entities depend on them)
+                   'affiliates': 2, 'orders': 3, 'opportunities': 4, 'tasks': 5, 'notes': 6, 'campaigns': 7, }
+
+# Fields of an error entry used for reprocessing; the rest is dropped while parsing
+ERROR_ENTRY_FIELDS = ('entity_type', 'entity_id', 'error_type', 'error_message', 'stack_trace')
+
+# Number of worker threads reprocessing the entities of one type concurrently
+REPROCESS_WORKERS = 8
+
+# Entity types whose loaders already batch loads by ID; these are loaded with one loader instead of per-entity workers
+BATCH_ENTITY_TYPES = ('tags', 'campaigns', 'subscriptions')
+
 
 class ErrorReprocessor:
     """Class to handle reprocessing of failed entities from error logs."""
@@ -34,29 +60,43 @@ class ErrorReprocessor:
         self.errors_dir = "logs/errors"
         self.data_load_manager = DataLoadManager()
 
+        # Per-thread session and loaders of the reprocessing workers
+        self._worker_state = threading.local()
+        self._worker_sessions = []
+        self._worker_sessions_lock = threading.Lock()
+
+        # (entity_type, entity_id) pairs already reprocessed, so overlapping passes skip them
+        self._attempted: Set[Tuple[str, int]] = set()
+
         # Initialize logging
         initialize_loggers()
 
         # Statistics
-        self.stats = {'total_errors': 0, 'processed_errors': 0, 'successful_reprocesses': 0, 'failed_reprocesses': 0, 'missing_dependencies': defaultdict(set), 'processed_entities': defaultdict(set)}
+        self.stats = {'total_errors': 0, 'processed_errors': 0, 'successful_reprocesses': 0, 'failed_reprocesses': 0, 'missing_dependencies': defaultdict(set), 'processed_entities': defaultdict(int)}
 
     def load_error_files(self) -> List[str]:
-        """Load all error log files from the errors directory."""
-        pattern = os.path.join(self.errors_dir, "data_load_errors_*.json")
-        error_files = glob.glob(pattern)
+        """Load all error log files from the errors directory, including JSON array logs of earlier versions."""
+        error_files = [file_path for extension in ('jsonl', 'json') for file_path in glob.glob(os.path.join(self.errors_dir, f"data_load_errors_*.{extension}"))]
         logger.info(f"Found {len(error_files)} error log files")
         return error_files
 
-    def parse_error_log(self, file_path: str) -> List[Dict]:
-        """Parse a single error log file and return list of error entries."""
+    def parse_error_log(self, file_path: str) -> Iterator[Dict]:
+        """Stream the error entries of a single error log file.
+
+        The file is parsed incrementally, and only the fields needed for
+        reprocessing are kept from each entry. JSON Lines logs hold one entry
+        per line; JSON logs of earlier versions hold an array of entries.
+        """
+        error_count = 0
+        prefix = '' if file_path.endswith('.jsonl') else 'item'
         try:
-            with open(file_path, 'r') as f:
-                errors = json.load(f)
-            logger.info(f"Loaded {len(errors)} errors from {file_path}")
-            return errors
+            with open(file_path, 'rb') as f:
+                for error_entry in ijson.items(f, prefix, multiple_values=True):
+                    error_count += 1
+                    yield {field: error_entry[field] for field in ERROR_ENTRY_FIELDS if field in error_entry}
+            logger.info(f"Loaded {error_count} errors from {file_path}")
         except Exception as e:
-            logger.error(f"Error loading {file_path}: {e}")
-            return []
+            logger.error(f"Error loading {file_path} after {error_count} errors: {e}")
 
     def extract_missing_dependencies(self, error_entry: Dict) -> List[Tuple[str, int]]:
         """
@@ -68,16 +108,10 @@ class ErrorReprocessor:
         stack_trace = error_entry.get('stack_trace', '')
 
         # Look for foreign key violation patterns
-        # Pattern: Key (contact_id)=(1813) is not present in table "contacts"
-        fk_pattern = r'Key \((\w+)\)=\((\d+)\) is not present in table "(\w+)"'
-        matches = re.findall(fk_pattern, stack_trace)
+        matches = FK_VIOLATION_PATTERN.findall(stack_trace)
 
         for field_name, entity_id, table_name in matches:
-            # Map table names to entity types
-            table_to_entity = {'contacts': 'contacts', 'products': 'products', 'affiliates': 'affiliates', 'orders': 'orders', 'opportunities': 'opportunities', 'tasks': 'tasks', 'notes': 'notes',
-                               'campaigns': 'campaigns', }
-
-            entity_type = table_to_entity.get(table_name)
+            entity_type = TABLE_TO_ENTITY.get(table_name)
             if entity_type:
                 missing_deps.append((entity_type, int(entity_id)))
                 self.stats['missing_dependencies'][entity_type].add(int(entity_id))
@@ -96,58 +130,111 @@ class ErrorReprocessor:
 
         return False
 
-    def reprocess_entity(self, entity_type: str, entity_id: int) -> bool:
-        """Attempt to reprocess a single entity using the new DataLoadManager."""
-        try:
-            logger.info(f"Attempting to reprocess {entity_type} ID: {entity_id}")
+    def reprocess_entities(self, entity_type: str, entity_ids: Iterable[int]) -> Tuple[int, int]:
+        """Reprocess entities of one type, concurrently unless the loader batches by ID itself.
 
-            # Use the DataLoadManager to load the specific entity
-            result = self.data_load_manager.load_entity(entity_type, entity_id)
+        Worker threads load the IDs in batches of COMMIT_BATCH_SIZE, committing once per batch.
+        IDs already attempted, e.g. a missing dependency that also failed itself, are skipped.
 
-            if result.success_count > 0:
-                logger.info(f"Successfully reprocessed {entity_type} ID: {entity_id}")
-                self.stats['successful_reprocesses'] += 1
-                self.stats['processed_entities'][entity_type].add(entity_id)
-                return True
-            else:
-                logger.warning(f"Failed to reprocess {entity_type} ID: {entity_id}")
-                self.stats['failed_reprocesses'] += 1
-                return False
+        Args:
+            entity_type: Type of the entities to reprocess
+            entity_ids: IDs of the entities to reprocess
+
+        Returns:
+            Tuple of (success count, failed count)
+        """
+        entity_ids = [entity_id for entity_id in dict.fromkeys(entity_ids) if (entity_type, entity_id) not in self._attempted]
+        self._attempted.update((entity_type, entity_id) for entity_id in entity_ids)
+        if not entity_ids:
+            return 0, 0
+
+        if entity_type in BATCH_ENTITY_TYPES:
+            result = self.data_load_manager.load_entities(entity_type, entity_ids)
+            success_count, failed_count = result.success_count, result.failed_count
+        else:
+            success_count = 0
+            failed_count = 0
+            try:
+                with ThreadPoolExecutor(max_workers=REPROCESS_WORKERS, thread_name_prefix="reprocess") as pool:
+                    futures = {pool.submit(self._reprocess_batch, entity_type, entity_ids[start:start + COMMIT_BATCH_SIZE]): start for start in range(0, len(entity_ids), COMMIT_BATCH_SIZE)}
+                    for future in as_completed(futures):
+                        batch_success_count, batch_failed_count = future.result()
+                        success_count += batch_success_count
+                        failed_count += batch_failed_count
+            finally:
+                self._close_worker_sessions()
+
+        self.stats['successful_reprocesses'] += success_count
+        self.stats['failed_reprocesses'] += failed_count
+        self.stats['processed_entities'][entity_type] += success_count
+        return success_count, failed_count
+
+    def _reprocess_batch(self, entity_type: str, entity_ids: List[int]) -> Tuple[int, int]:
+        """Reprocess a batch of entities on the calling thread's own session, committing once.
+
+        Returns:
+            Tuple of (success count, failed count)
+        """
+        try:
+            logger.info(f"Attempting to reprocess {len(entity_ids)} {entity_type}")
+            success_count, failed_count = self._get_worker_loader(entity_type).load_entities_by_ids(entity_ids)
+            logger.info(f"Reprocessed {success_count}/{len(entity_ids)} {entity_type} in batch")
+            return success_count, failed_count
 
         except Exception as e:
-            logger.error(f"Error reprocessing {entity_type} ID {entity_id}: {e}")
-            self.stats['failed_reprocesses'] += 1
-            return False
+            logger.error(f"Error reprocessing batch of {entity_type}: {e}")
+            return 0, len(entity_ids)
+
+    def _get_worker_loader(self, entity_type: str) -> Any:
+        """Get the calling thread's loader for an entity type, creating its session and loader on first use."""
+        state = self._worker_state
+        if not hasattr(state, 'session'):
+            state.session = SessionLocal()
+            state.loaders = {}
+            with self._worker_sessions_lock:
+                self._worker_sessions.append(state.session)
+        if entity_type not in state.loaders:
+            state.loaders[entity_type] = LoaderFactory.create_loader(entity_type, self.client, state.session, self.data_load_manager.checkpoint_manager)
+        return state.loaders[entity_type]
+
+    def _close_worker_sessions(self) -> None:
+        """Close the sessions opened by worker threads."""
+        with self._worker_sessions_lock:
+            sessions, self._worker_sessions = self._worker_sessions, []
+        for session in sessions:
+            try:
+                session.close()
+            except Exception as e:
+                logger.warning(f"Error closing worker session: {str(e)}")
 
     def reprocess_missing_dependencies(self) -> None:
         """Reprocess all missing dependencies in dependency order."""
-        # Define dependency order (entities that should be loaded first)
-        dependency_order = ['products',  # Load products first (subscription plans depend on them)
-                            'contacts',  # Load contacts (many entities depend on them)
-                            'affiliates',  # Load affiliates
-                            'orders',  # Load orders
-                            'opportunities',  # Load opportunities
-                            'tasks',  # Load tasks
-                            'notes',  # Load notes
-                            'campaigns',  # Load campaigns
-                            ]
-
         logger.info("Starting to reprocess missing dependencies...")
 
-        for entity_type in dependency_order:
-            if entity_type in self.stats['missing_dependencies']:
-                missing_ids = self.stats['missing_dependencies'][entity_type]
-                logger.info(f"Reprocessing {len(missing_ids)} missing {entity_type}")
+        # Types without a priority are not reprocessed as dependencies
+        entity_types = sorted((entity_type for entity_type in self.stats['missing_dependencies'] if entity_type in ENTITY_PRIORITY), key=ENTITY_PRIORITY.get)
 
-                for entity_id in missing_ids:
-                    self.reprocess_entity(entity_type, entity_id)
+        for entity_type in entity_types:
+            missing_ids = self.stats['missing_dependencies'][entity_type]
+            logger.info(f"Reprocessing {len(missing_ids)} missing {entity_type}")
 
-    def reprocess_failed_entities(self, errors: List[Dict]) -> None:
-        """Reprocess entities that failed during the original load."""
-        logger.info("Starting to reprocess failed entities...")
+            success_count, _ = self.reprocess_entities(entity_type, missing_ids)
+            logger.info(f"Reprocessed {success_count}/{len(missing_ids)} missing {entity_type}")
+
+    def scan_errors(self, errors: Iterable[Dict]) -> Dict[str, Dict[int, None]]:
+        """Record missing dependencies and collect the failed entities to reprocess in a single pass.
+
+        Args:
+            errors: Error entries, e.g. streamed from the error logs
+
+        Returns:
+            IDs of the entities to reprocess by entity type, in the order they first appear
+        """
+        failed_entities = defaultdict(dict)
 
         for error_entry in errors:
             self.stats['total_errors'] += 1
+            self.extract_missing_dependencies(error_entry)
 
             if not self.should_reprocess_entity(error_entry):
                 continue
@@ -157,7 +244,23 @@ class ErrorReprocessor:
 
             if entity_type and entity_id:
                 self.stats['processed_errors'] += 1
-                self.reprocess_entity(entity_type, entity_id)
+                failed_entities[entity_type][entity_id] = None
+
+        return failed_entities
+
+    def reprocess_failed_entities(self, failed_entities: Dict[str, Iterable[int]]) -> None:
+        """Reprocess entities that failed during the original load.
+
+        Each entity type is reprocessed in turn, in the order the types first
+        appear in the errors.
+
+        Args:
+            failed_entities: IDs of the entities to reprocess by entity type, as returned by scan_errors
+        """
+        logger.info("Starting to reprocess failed entities...")
+
+        for entity_type, entity_ids in failed_entities.items():
+            self.reprocess_entities(entity_type, entity_ids)
 
     def run(self) -> None:
         """Main method to run the error reprocessing."""
@@ -169,28 +272,22 @@ class ErrorReprocessor:
             logger.info("No error files found to reprocess")
             return
 
-        # Process each error file
-        all_errors = []
-        for error_file in error_files:
-            errors = self.parse_error_log(error_file)
-            all_errors.extend(errors)
+        # Stream the errors of all files through a single pass
+        all_errors = (error_entry for error_file in error_files for error_entry in self.parse_error_log(error_file))
+        failed_entities = self.scan_errors(all_errors)
 
-        if not all_errors:
+        if not self.stats['total_errors']:
             logger.info("No errors found to reprocess")
             return
 
-        logger.info(f"Found {len(all_errors)} total errors to process")
-
-        # Extract missing dependencies from all errors
-        for error_entry in all_errors:
-            self.extract_missing_dependencies(error_entry)
+        logger.info(f"Found {self.stats['total_errors']} total errors to process")
 
         # First, reprocess missing dependencies
         if any(self.stats['missing_dependencies'].values()):
             self.reprocess_missing_dependencies()
 
         # Then, reprocess failed entities
-        self.reprocess_failed_entities(all_errors)
+        self.reprocess_failed_entities(failed_entities)
 
         # Print statistics
         self.print_statistics()
@@ -210,13 +307,14 @@ class ErrorReprocessor:
 
         if self.stats['processed_entities']:
             logger.info("Successfully reprocessed entities:")
-            for entity_type, entity_ids in self.stats['processed_entities'].items():
-                logger.info(f"  {entity_type}: {len(entity_ids)} entities")
+            for entity_type, count in self.stats['processed_entities'].items():
+                logger.info(f"  {entity_type}: {count} entities")
 
         logger.info("=== End Statistics ===")
 
     def close(self):
-        """Close database connection."""
+        """Close database connections."""
+        self._close_worker_sessions()
         self.db.close()
         self.data_load_manager.close()
 
@@ -1,5 +1,8 @@
 import enum
+import functools
 import logging
+import re
+import sys
 from datetime import date, datetime, timezone
 from typing import Any, Callable, Dict, List, Optional, Tuple, Type
 
@@ -13,6 +16,116 @@ from src.models.models import (AccountProfile, Affiliate, AffiliateClawback, Aff
 
 logger = logging.getLogger(__name__)
 
+# Contact and order fields copied from the API data unchanged, under the same name
+CONTACT_FIELDS = ('id', 'given_name', 'family_name', 'middle_name', 'company_name', 'job_title', 'email_opted_in', 'score_value', 'owner_id', 'last_updated_utc_millis', 'contact_type',
+                  'duplicate_option', 'lead_source_id', 'preferred_locale', 'preferred_name', 'spouse_name', 'time_zone', 'website', 'year_created')
+ORDER_FIELDS = ('id', 'title', 'recurring', 'total', 'notes', 'terms', 'order_type', 'lead_affiliate_id', 'sales_affiliate_id', 'total_paid', 'total_due', 'refund_total', 'allow_payment',
+                'allow_paypal', 'invoice_number', 'contact_id', 'payment_gateway_id', 'subscription_plan_id')
+# Order item fields, some under camelCase API keys
+ORDER_ITEM_FIELDS = (('job_recurring_id', 'jobRecurringId'), 'name', 'description', 'type', 'notes', 'quantity', 'cost', 'price', 'discount', ('special_id', 'specialId'),
+                     ('special_amount', 'specialAmount'), ('special_pct_or_amt', 'specialPctOrAmt'))
+# Product fields, some with defaults for missing keys
+PRODUCT_FIELDS = ('id', ('sku', 'sku', ''), ('active', 'active', True), 'url', 'product_name', ('sub_category_id', 'sub_category_id', 0), 'product_desc', 'product_price', 'product_short_desc',
+                  ('subscription_only', 'subscription_only', False), ('status', 'status', 1))
+# Fields of the flat transforms whose dates and enums are converted by the generated copier
+ORDER_CONVERTED_FIELDS = ('status', 'source_type', 'creation_date', 'modification_date', 'order_date')
+ORDER_PAYMENT_FIELDS = ('id', 'order_id', 'amount', 'note', 'invoice_id', 'payment_id', 'pay_date', 'pay_status', 'last_updated', ('skip_commission', 'skip_commission', False),
+                        ('refund_invoice_payment_id', 'refund_invoice_payment_id', 0), 'created_at', 'modified_at')
+ORDER_TRANSACTION_FIELDS = ('id', ('test', 'test', False), 'amount', 'currency', 'gateway', ('payment_date', 'paymentDate'), 'type', 'status', 'errors', 'contact_id', 'transaction_date',
+                            'gateway_account_name', 'order_ids', 'collection_method', 'payment_id')
+NOTE_FIELDS = ('id', 'contact_id', 'title', 'body', 'type', 'created_at', 'modified_at')
+TASK_FIELDS = ('id', 'contact_id', 'title', 'notes', 'priority', 'status', 'type', 'due_date')
+CAMPAIGN_FIELDS = ('id', 'name', 'description', 'status', 'created_at', 'modified_at')
+SUBSCRIPTION_FIELDS = ('id', 'product_id', 'subscription_plan_id', 'status', 'next_bill_date', 'contact_id', 'payment_gateway_id', 'credit_card_id', 'start_date', 'end_date', 'billing_cycle',
+                       'created_at', 'modified_at')
+AFFILIATE_FIELDS = ('id', 'code', 'contact_id', 'name', 'parent_id', 'status', 'notify_on_lead', 'notify_on_sale', 'track_leads_for')
+AFFILIATE_COMMISSION_FIELDS = ('id', 'affiliate_id', 'amount_earned', 'contact_id', 'contact_first_name', 'contact_last_name', 'date_earned', 'description', 'invoice_id', 'product_name',
+                               'sales_affiliate_id', 'sold_by_first_name', 'sold_by_last_name')
+AFFILIATE_CLAWBACK_FIELDS = ('id', 'affiliate_id', 'amount', 'contact_id', 'date_earned', 'description', 'family_name', 'given_name', 'invoice_id', 'product_name', 'sale_affiliate_id',
+                             'sold_by_family_name', 'sold_by_given_name', 'subscription_plan_name')
+
+# Contact payload fields that hold lists of related records
+CONTACT_LIST_FIELDS = ('email_addresses', 'phone_numbers', 'addresses', 'fax_numbers', 'tag_ids', 'opportunities', 'tasks', 'notes', 'orders', 'subscriptions')
+
+
+def _field_copier(fields: Tuple[Any, ...], converters: Optional[Dict[str, Callable[[Any], Any]]] = None) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """Generate a function that copies fields from API data into a keyword dict.
+
+    The function body is a single dict display with one .get() per field,
+    which runs faster than iterating over the field names for every record.
+    Converters are bound as globals of the generated function, so each
+    converted field costs one call and no attribute lookups.
+
+    Args:
+        fields: Field names identical in the API data and the model, or
+            (attribute, API key) and (attribute, API key, default) tuples;
+            defaults must be literals
+        converters: Functions applied to the values of some fields, by attribute name
+
+    Returns:
+        Function taking API data and returning the field values by attribute name
+    """
+    converters = converters or {}
+    namespace: Dict[str, Any] = {}
+    entries = []
+    for field in fields:
+        attribute, key, *default = (field, field) if isinstance(field, str) else field
+        arguments = ', '.join(repr(argument) for argument in (key, *default))
+        value = f'get({arguments})'
+        if attribute in converters:
+            namespace[f'convert_{attribute}'] = converters[attribute]
+            value = f'convert_{attribute}({value})'
+        entries.append(f'{attribute!r}: {value}')
+    source = 'def copy_fields(data):\n    get = data.get\n    return {' + ', '.join(entries) + '}\n'
+    exec(source, namespace)
+    return namespace['copy_fields']
+
+
+# Generated once at import for the hot contact, order item and product transforms
+_copy_contact_fields = _field_copier(CONTACT_FIELDS)
+_copy_order_item_fields = _field_copier(ORDER_ITEM_FIELDS)
+_copy_product_fields = _field_copier(PRODUCT_FIELDS)
+
+
+# Number of distinct datetime strings whose parsed value is kept; timestamps recur across the records of a page
+DATETIME_CACHE_SIZE = 4096
+
+
+# fromisoformat accepts a trailing 'Z' from Python 3.11 on; earlier versions need it rewritten as +00:00
+_HAS_Z_ISOFORMAT = sys.version_info >= (3, 11)
+
+# strptime formats tried when fromisoformat rejects a string, before falling back to dateutil
+_FAST_FORMATS = ('%Y-%m-%dT%H:%M:%S.%f%z', '%Y-%m-%dT%H:%M:%S%z', '%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d')
+
+
+@functools.lru_cache(maxsize=DATETIME_CACHE_SIZE)
+def _parse_datetime_cached(dt_str: str) -> datetime:
+    """Parse a datetime string into a timezone-aware datetime object.
+
+    API timestamps are ISO-8601, so fromisoformat and a few strptime formats
+    are tried before dateutil's much slower generic parser. Results are
+    cached; failures raise and are therefore not cached.
+
+    Raises:
+        ValueError, TypeError: If the string cannot be parsed
+    """
+    normalized = dt_str[:-1] + '+00:00' if not _HAS_Z_ISOFORMAT and dt_str.endswith('Z') else dt_str
+    try:
+        dt = datetime.fromisoformat(normalized)
+    except ValueError:
+        for fmt in _FAST_FORMATS:
+            try:
+                dt = datetime.strptime(normalized, fmt)
+                break
+            except ValueError:
+                continue
+        else:
+            dt = parse_datetime(dt_str)
+    # Ensure timezone awareness
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
 
 def safe_parse_datetime(dt_str: Optional[str]) -> Optional[datetime]:
     """Safely parse a datetime string into a timezone-aware datetime object.
@@ -27,22 +140,22 @@ def safe_parse_datetime(dt_str: Optional[str]) -> Optional[datetime]:
         return None
 
     try:
-        # Try parsing with dateutil first
-        dt = parse_datetime(dt_str)
-        # Ensure timezone awareness
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt
-    except (ValueError, TypeError) as e:
-        try:
-            # Try ISO format as fallback
-            dt = datetime.fromisoformat(dt_str.replace('Z', '+00:00'))
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Error parsing datetime {dt_str}: {e}")
-            return None
+        return _parse_datetime_cached(dt_str)
+    except (ValueError, TypeError, AttributeError) as e:
+        logger.warning(f"Error parsing datetime {dt_str}: {e}")
+        return None
+
+
+# CustomFieldType values whose API name differs from the database enum value
+_CUSTOM_FIELD_API_MAP = {'TextArea': 'MULTILINE', 'WholeNumber': 'NUMBER', 'Website': 'URL', 'Email': 'EMAIL'}
+
+
+@functools.lru_cache(maxsize=None)
+def _enum_upper_index(enum_class: Type[enum.Enum]) -> Dict[str, enum.Enum]:
+    """Map the uppercased values and names of an enum's members to the members; values take precedence."""
+    index = {member.name.upper(): member for member in enum_class}
+    index.update({str(member.value).upper(): member for member in enum_class})
+    return index
 
 
 def safe_enum_convert(value: Any, enum_class: Type[enum.Enum], default: Optional[enum.Enum] = None) -> Optional[enum.Enum]:
@@ -58,50 +171,87 @@ def safe_enum_convert(value: Any, enum_class: Type[enum.Enum], default: Optional
     """
     if value is None:
         return default
+    if isinstance(value, enum_class):
+        return value
 
     # Special mappings for CustomFieldType to handle API values that don't match database enum
-    if enum_class == CustomFieldType:
-        api_to_db_mapping = {'TextArea': 'MULTILINE', 'WholeNumber': 'NUMBER', 'Website': 'URL', 'Email': 'EMAIL'}
-
-        # Check if we have a direct mapping
-        if str(value) in api_to_db_mapping:
+    if enum_class is CustomFieldType:
+        db_value = _CUSTOM_FIELD_API_MAP.get(value if isinstance(value, str) else str(value))
+        if db_value is not None:
             try:
-                return enum_class(api_to_db_mapping[str(value)])
+                return enum_class(db_value)
             except ValueError:
                 pass
 
+    # First try a direct lookup by value, without raising on a miss
     try:
-        # First try direct conversion
-        return enum_class(value)
-    except ValueError:
-        # If that fails, try case-insensitive matching
-        try:
-            # Convert both the input and enum values to uppercase for comparison
-            value_upper = str(value).upper()
+        member = enum_class._value2member_map_.get(value)
+    except TypeError:
+        # Unhashable values cannot match a member value
+        member = None
+    if member is not None:
+        return member
+
+    # If that fails, try case-insensitive matching on values, then names
+    try:
+        return _enum_upper_index(enum_class).get(str(value).upper(), default)
+    except Exception:
+        # If all else fails, return default
+        return default
 
-            # Try to find a matching enum by comparing uppercase values
-            for enum_member in enum_class:
-                if str(enum_member.value).upper() == value_upper:
-                    return enum_member
 
-            # If no match found, try to find by enum name
-            for enum_member in enum_class:
-                if enum_member.name.upper() == value_upper:
-                    return enum_member
+def _enum_converter(enum_class: Type[enum.Enum]) -> Callable[[Any], Optional[enum.Enum]]:
+    """Return a converter of values to members of enum_class for a generated field copier."""
+    return functools.partial(safe_enum_convert, enum_class=enum_class)
 
-        except Exception:
-            pass
 
-        # If all else fails, return default
-        return default
+def _date_converters(*attributes: str) -> Dict[str, Callable[[Any], Optional[datetime]]]:
+    """Return datetime converters for the given attributes of a generated field copier."""
+    return dict.fromkeys(attributes, safe_parse_datetime)
 
 
-def transform_list_response(api_data: Dict[str, Any], transformer_func: Callable) -> Tuple[List[Any], Dict[str, Any]]:
+def _note_type_value(value: Any) -> Optional[str]:
+    """Convert an API note type to the string value of its NoteType member, as notes store the value."""
+    note_type = safe_enum_convert(value, NoteType)
+    return note_type.value if note_type else None
+
+
+# Generated once the date and enum converters exist, for the flat transforms that only copy and convert fields
+_copy_order_fields = _field_copier(ORDER_FIELDS + ORDER_CONVERTED_FIELDS, {'status': _enum_converter(OrderStatus), 'source_type': _enum_converter(OrderSourceType),
+                                                                           **_date_converters('creation_date', 'modification_date', 'order_date')})
+_copy_order_payment_fields = _field_copier(ORDER_PAYMENT_FIELDS, _date_converters('pay_date', 'last_updated', 'created_at', 'modified_at'))
+_copy_order_transaction_fields = _field_copier(ORDER_TRANSACTION_FIELDS, _date_converters('payment_date', 'transaction_date'))
+_copy_note_fields = _field_copier(NOTE_FIELDS, {'type': _note_type_value, **_date_converters('created_at', 'modified_at')})
+_copy_task_fields = _field_copier(TASK_FIELDS, {'priority': _enum_converter(TaskPriority), 'status': _enum_converter(TaskStatus), **_date_converters('due_date')})
+_copy_campaign_fields = _field_copier(CAMPAIGN_FIELDS, {'status': _enum_converter(CampaignStatus), **_date_converters('created_at', 'modified_at')})
+_copy_subscription_fields = _field_copier(SUBSCRIPTION_FIELDS, {'status': _enum_converter(SubscriptionStatus),
+                                                                **_date_converters('next_bill_date', 'start_date', 'end_date', 'created_at', 'modified_at')})
+_copy_affiliate_fields = _field_copier(AFFILIATE_FIELDS, {'status': _enum_converter(AffiliateStatus)})
+_copy_affiliate_commission_fields = _field_copier(AFFILIATE_COMMISSION_FIELDS, _date_converters('date_earned'))
+_copy_affiliate_clawback_fields = _field_copier(AFFILIATE_CLAWBACK_FIELDS, _date_converters('date_earned'))
+
+
+def _transform_item(item_data: Any, transformer_func: Callable) -> Any:
+    """Transform one item of a list response, returning None if it is skipped or fails."""
+    if not isinstance(item_data, dict):
+        logger.warning(f"Skipping non-dict item: {type(item_data)}")
+        return None
+    try:
+        return transformer_func(item_data)
+    except Exception as e:
+        logger.error(f"Error transforming item: {str(e)}")
+        logger.debug(f"Problematic item data: {item_data}")
+        return None
+
+
+def transform_list_response(api_data: Dict[str, Any], transformer_func: Callable, list_key: Optional[str] = None) -> Tuple[List[Any], Dict[str, Any]]:
     """Transform a list response from the API into a list of model instances.
     
     Args:
         api_data: The API response data
         transformer_func: Function to transform individual items
+        list_key: Key of the item list in the response; when omitted or absent
+            from the response, the first list in the response is used
         
     Returns:
         Tuple of (list of transformed items, pagination info)
@@ -112,14 +262,16 @@ def transform_list_response(api_data: Dict[str, Any], transformer_func: Callable
         - count: Number of items in the current page
         - total: Total number of items available
     """
-    items = []
     pagination = {}
 
     try:
         # Handle different response formats
         if isinstance(api_data, dict):
             # Extract items based on response format
-            if 'items' in api_data:
+            if list_key is not None and isinstance(api_data.get(list_key), list):
+                items_data = api_data[list_key]
+                pagination = {'next': api_data.get('next'), 'previous': api_data.get('previous'), 'count': api_data.get('count', len(items_data)), 'total': api_data.get('total', len(items_data))}
+            elif 'items' in api_data:
                 items_data = api_data['items']
                 # For entity-specific lists, extract pagination info if available
                 pagination = {'next': api_data.get('next'), 'previous': api_data.get('previous'), 'count': api_data.get('count', len(items_data)), 'total': api_data.get('total', len(items_data))}
@@ -144,20 +296,8 @@ def transform_list_response(api_data: Dict[str, Any], transformer_func: Callable
             logger.error(f"Unexpected API response type: {type(api_data)}")
             return [], {}
 
-        # Transform items
-        for item_data in items_data:
-            try:
-                if not isinstance(item_data, dict):
-                    logger.warning(f"Skipping non-dict item: {type(item_data)}")
-                    continue
-
-                transformed_item = transformer_func(item_data)
-                if transformed_item:
-                    items.append(transformed_item)
-            except Exception as e:
-                logger.error(f"Error transforming item: {str(e)}")
-                logger.debug(f"Problematic item data: {item_data}")
-                continue
+        # Transform items, dropping the ones that are skipped or fail
+        items = [item for item_data in items_data if (item := _transform_item(item_data, transformer_func))]
 
         return items, pagination
 
@@ -177,17 +317,42 @@ def transform_contact(contact_data: Dict[str, Any]) -> Contact:
     if source_type:
         source_type = safe_enum_convert(source_type, ContactSourceType)
 
-    # Helper function to safely parse datetime
-    def safe_parse_datetime(dt_str: Optional[str]) -> Optional[datetime]:
-        if not dt_str:
-            return None
-        try:
-            return parse_datetime(dt_str)
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Error parsing datetime {dt_str}: {e}")
-            return None
+    # The epoch milliseconds of the last update give modified_at without parsing a string
+    modified_millis = contact_data.get('last_updated_utc_millis')
+    modified_at: Optional[datetime]
+    if isinstance(modified_millis, int) and modified_millis > 0:
+        modified_at = datetime.fromtimestamp(modified_millis / 1000, tz=timezone.utc)
+    else:
+        modified_at = safe_parse_datetime(contact_data.get('modified_at'))
 
-    return Contact(id=contact_data.get('id'), given_name=contact_data.get('given_name'), family_name=contact_data.get('family_name'), middle_name=contact_data.get('middle_name'), company_name=contact_data.get('company_name'), job_title=contact_data.get('job_title'), email_opted_in=contact_data.get('email_opted_in'), email_status=email_status, score_value=contact_data.get('score_value'), owner_id=contact_data.get('owner_id'), created_at=safe_parse_datetime(contact_data.get('created_at')), modified_at=safe_parse_datetime(contact_data.get('modified_at')), last_updated_utc_millis=contact_data.get('last_updated_utc_millis'), anniversary=safe_parse_datetime(contact_data.get('anniversary')), birthday=safe_parse_datetime(contact_data.get('birthday')), contact_type=contact_data.get('contact_type'), duplicate_option=contact_data.get('duplicate_option'), lead_source_id=contact_data.get('lead_source_id'), preferred_locale=contact_data.get('preferred_locale'), preferred_name=contact_data.get('preferred_name'), source_type=source_type, spouse_name=contact_data.get('spouse_name'), time_zone=contact_data.get('time_zone'), website=contact_data.get('website'), year_created=contact_data.get('year_created'))
+    return Contact(**_copy_contact_fields(contact_data), email_status=email_status, source_type=source_type, created_at=safe_parse_datetime(contact_data.get('created_at')), modified_at=modified_at, anniversary=safe_parse_datetime(contact_data.get('anniversary')), birthday=safe_parse_datetime(contact_data.get('birthday')))
+
+
+def validate_contact_payload(api_data: Any) -> None:
+    """Check the shape of a contact payload before any of it is transformed.
+
+    Malformed payloads are rejected up front instead of failing part way
+    through building the contact and its related records.
+
+    Args:
+        api_data: The contact data from the API
+
+    Raises:
+        ValueError: If the payload is not a dict, has no integer ID, or has a
+            related-record field of the wrong type
+    """
+    if not isinstance(api_data, dict):
+        raise ValueError(f"Contact payload must be a dict, got {type(api_data).__name__}")
+    contact_id = api_data.get('id')
+    if not isinstance(contact_id, int) or isinstance(contact_id, bool):
+        raise ValueError(f"Contact payload has invalid id: {contact_id!r}")
+    for field in CONTACT_LIST_FIELDS:
+        value = api_data.get(field)
+        if value is not None and not isinstance(value, list):
+            raise ValueError(f"Contact {contact_id} field '{field}' must be a list, got {type(value).__name__}")
+    custom_fields = api_data.get('custom_fields')
+    if custom_fields is not None and not isinstance(custom_fields, dict):
+        raise ValueError(f"Contact {contact_id} field 'custom_fields' must be a dict, got {type(custom_fields).__name__}")
 
 
 def transform_contact_with_related(api_data: Dict[str, Any], db_session=None) -> Contact:
@@ -203,166 +368,107 @@ def transform_contact_with_related(api_data: Dict[str, Any], db_session=None) ->
         
     Returns:
         Contact instance with all related data
+
+    Raises:
+        ValueError: If the payload is malformed (see validate_contact_payload)
     """
+    validate_contact_payload(api_data)
+
     # First transform the basic contact data
     contact = transform_contact(api_data)
 
-    # Handle email addresses
-    if 'email_addresses' in api_data:
-        for email in api_data['email_addresses']:
-            try:
-                if isinstance(email, dict):
-                    email_address = transform_email_address(email, contact.id)
-                else:
-                    email_address = transform_email_address(email.__dict__, contact.id)
-                contact.email_addresses.append(email_address)
-            except Exception as e:
-                logger.error(f"Error transforming email address for contact {contact.id}: {str(e)}")
-
-    # Handle phone numbers
-    if 'phone_numbers' in api_data:
-        for phone in api_data['phone_numbers']:
-            try:
-                if isinstance(phone, dict):
-                    phone_number = transform_phone_number(phone, contact.id)
-                else:
-                    phone_number = transform_phone_number(phone.__dict__, contact.id)
-                contact.phone_numbers.append(phone_number)
-            except Exception as e:
-                logger.error(f"Error transforming phone number for contact {contact.id}: {str(e)}")
-
-    # Handle addresses
-    if 'addresses' in api_data:
-        for address in api_data['addresses']:
-            try:
-                if isinstance(address, dict):
-                    address_obj = transform_contact_address(address, contact.id)
-                else:
-                    address_obj = transform_contact_address(address.__dict__, contact.id)
-                contact.addresses.append(address_obj)
-            except Exception as e:
-                logger.error(f"Error transforming address for contact {contact.id}: {str(e)}")
-
-    # Handle fax numbers
-    if 'fax_numbers' in api_data:
-        for fax in api_data['fax_numbers']:
-            try:
-                if isinstance(fax, dict):
-                    fax_number = transform_fax_number(fax, contact.id)
-                else:
-                    fax_number = transform_fax_number(fax.__dict__, contact.id)
-                contact.fax_numbers.append(fax_number)
-            except Exception as e:
-                logger.error(f"Error transforming fax number for contact {contact.id}: {str(e)}")
+    # Handle email addresses, phone numbers, addresses and fax numbers
+    _assign_related(contact, api_data, _CONTACT_CHILD_SPECS)
 
     # Handle tags
-    if 'tag_ids' in api_data:
-        for tag_id in api_data['tag_ids']:
+    tag_ids = api_data.get('tag_ids')
+    if tag_ids:
+        # One timestamp for all tags of the contact
+        now = datetime.now(timezone.utc)
+        tags = []
+        for tag_id in tag_ids:
             try:
                 # Create a minimal Tag object with just the ID
-                tag_obj = Tag(id=tag_id, name=f"Tag {tag_id}",  # Generic name for new tags
-                              created_at=datetime.now(timezone.utc))
-                contact.tags.append(tag_obj)
+                tags.append(Tag(id=tag_id, name=f"Tag {tag_id}",  # Generic name for new tags
+                                created_at=now))
             except Exception as e:
                 logger.error(f"Error transforming tag for contact {contact.id}: {str(e)}")
+        contact.tags = tags
 
     # Handle custom fields
-    if 'custom_fields' in api_data:
-        for field_name, field_def in api_data['custom_fields'].items():
+    custom_fields = api_data.get('custom_fields')
+    if custom_fields:
+        custom_field_values = []
+        for field_name, field_def in custom_fields.items():
             try:
-                custom_field = transform_custom_field(field_name, field_def)
                 if 'value' in field_def:
-                    custom_field_value = transform_custom_field_value({'value': field_def['value']}, contact.id, custom_field.id)
-                    contact.custom_field_values.append(custom_field_value)
+                    # Only the field ID is needed, so the CustomField itself is not built
+                    custom_field_values.append(transform_custom_field_value(field_def['value'], contact.id, field_def.get('id')))
             except Exception as e:
                 logger.error(f"Error transforming custom field {field_name} for contact {contact.id}: {str(e)}")
+        if custom_field_values:
+            contact.custom_field_values = custom_field_values
 
-    # Handle opportunities
-    if 'opportunities' in api_data:
-        for opportunity in api_data['opportunities']:
-            try:
-                if isinstance(opportunity, dict):
-                    opportunity_obj = transform_opportunity(opportunity)
-                else:
-                    opportunity_obj = transform_opportunity(opportunity.__dict__)
-                contact.opportunities.append(opportunity_obj)
-            except Exception as e:
-                logger.error(f"Error transforming opportunity for contact {contact.id}: {str(e)}")
+    # Handle opportunities, tasks, notes, orders and subscriptions
+    _assign_related(contact, api_data, _CONTACT_ENTITY_SPECS)
 
-    # Handle tasks
-    if 'tasks' in api_data:
-        for task in api_data['tasks']:
-            try:
-                if isinstance(task, dict):
-                    task_obj = transform_task(task)
-                else:
-                    task_obj = transform_task(task.__dict__)
-                contact.tasks.append(task_obj)
-            except Exception as e:
-                logger.error(f"Error transforming task for contact {contact.id}: {str(e)}")
+    return contact
 
-    # Handle notes
-    if 'notes' in api_data:
-        for note in api_data['notes']:
-            try:
-                if isinstance(note, dict):
-                    note_obj = transform_note(note)
-                else:
-                    note_obj = transform_note(note.__dict__)
-                contact.notes.append(note_obj)
-            except Exception as e:
-                logger.error(f"Error transforming note for contact {contact.id}: {str(e)}")
 
-    # Handle orders
-    if 'orders' in api_data:
-        for order in api_data['orders']:
-            try:
-                if isinstance(order, dict):
-                    order_obj = transform_order_with_items(order)
-                else:
-                    order_obj = transform_order_with_items(order.__dict__)
-                contact.orders.append(order_obj)
-            except Exception as e:
-                logger.error(f"Error transforming order for contact {contact.id}: {str(e)}")
+def _as_mapping(item: Any) -> Dict[str, Any]:
+    """Return API data as a dict, using the attribute dict of non-dict objects."""
+    return item if isinstance(item, dict) else item.__dict__
 
-    # Handle subscriptions
-    if 'subscriptions' in api_data:
-        for subscription in api_data['subscriptions']:
-            try:
-                if isinstance(subscription, dict):
-                    subscription_obj = transform_subscription(subscription)
-                else:
-                    subscription_obj = transform_subscription(subscription.__dict__)
-                contact.subscriptions.append(subscription_obj)
-            except Exception as e:
-                logger.error(f"Error transforming subscription for contact {contact.id}: {str(e)}")
 
-    return contact
+def _assign_related(contact: Contact, api_data: Dict[str, Any], specs: Tuple[Tuple[str, Callable, str, bool], ...]) -> None:
+    """Transform the related records listed in specs and assign them to the contact.
+
+    Each spec is (API field and relationship name, transform function,
+    description for error messages, whether the transform takes the contact
+    ID). Each collection is built as a plain list and assigned once, so the
+    relationship is set in one operation rather than appended to per record.
+    A record that fails to transform is logged and skipped.
+    """
+    for key, transform, description, takes_contact_id in specs:
+        items = api_data.get(key)
+        if not items:
+            continue
+        related = [record for item in items if (record := _transform_related(contact.id, item, transform, description, takes_contact_id)) is not None]
+        if related:
+            setattr(contact, key, related)
+
+
+def _transform_related(contact_id: int, item: Any, transform: Callable, description: str, takes_contact_id: bool) -> Any:
+    """Transform one related record of a contact, returning None if it fails."""
+    try:
+        data = _as_mapping(item)
+        return transform(data, contact_id) if takes_contact_id else transform(data)
+    except Exception as e:
+        logger.error(f"Error transforming {description} for contact {contact_id}: {str(e)}")
+        return None
 
 
 def transform_order_with_items(api_data: Dict[str, Any]) -> Order:
     """Transform API order data to Order model instance with its items."""
-    if not isinstance(api_data, dict):
-        api_data = api_data.__dict__
+    api_data = _as_mapping(api_data)
 
     order = transform_order(api_data)
 
-    # Transform order items
-    if 'order_items' in api_data:
+    # Transform order items; an empty list still replaces the stored items
+    order_items = api_data.get('order_items')
+    if order_items is not None:
         order.items = []
-        for item in api_data['order_items']:
+        for item in order_items:
             try:
-                if not isinstance(item, dict):
-                    item = item.__dict__
-                order.items.append(transform_order_item(item))
+                order.items.append(transform_order_item(_as_mapping(item)))
             except Exception as e:
                 logger.error(f"Error transforming order item: {str(e)}")
 
     # Handle payment plan data if it exists in the order response
-    if 'payment_plan' in api_data and api_data['payment_plan']:
+    payment_plan = api_data.get('payment_plan')
+    if payment_plan:
         try:
-            from src.transformers.transformers import transform_payment_plan
-            order.payment_plan = transform_payment_plan(api_data['payment_plan'], order.id)
+            order.payment_plan = transform_payment_plan(payment_plan, order.id)
         except Exception as e:
             logger.error(f"Error transforming payment plan for order {order.id}: {str(e)}")
 
@@ -434,16 +540,18 @@ def transform_custom_field(field_name: str, field_def: Dict[str, Any]) -> Custom
         return CustomField(id=field_def.get('id'), name=field_name, type=field_type, options=field_def.get('options'))
 
 
-def transform_custom_field_value(api_data: Dict[str, Any], entity_id: int, custom_field_id: int) -> ContactCustomFieldValue:
-    """Transform API custom field value data into a CustomFieldValue model instance."""
-    return ContactCustomFieldValue(id=api_data.get('id'), contact_id=entity_id, custom_field_id=custom_field_id, value=api_data.get('value'))
+def transform_custom_field_value(value: Any, entity_id: int, custom_field_id: int) -> ContactCustomFieldValue:
+    """Transform an API custom field value into a CustomFieldValue model instance; the database assigns the ID."""
+    return ContactCustomFieldValue(id=None, contact_id=entity_id, custom_field_id=custom_field_id, value=value)
 
 
-def transform_tag(api_data: Dict[str, Any]) -> Optional[Tag]:
+def transform_tag(api_data: Dict[str, Any], *, now: Optional[datetime] = None) -> Optional[Tag]:
     """Transform API tag data into a Tag model instance.
     
     Args:
         api_data: Dictionary containing tag data from the API
+        now: Timestamp used when the tag has no created_at; callers transforming
+            a batch pass one timestamp for the whole batch
         
     Returns:
         Tag instance or None if api_data is empty
@@ -452,26 +560,21 @@ def transform_tag(api_data: Dict[str, Any]) -> Optional[Tag]:
         return None
 
     try:
+        # Handle created_at timestamp
+        created_at = api_data.get('created_at')
+        created_at = safe_parse_datetime(created_at) if created_at else now or datetime.now(timezone.utc)
+
         # Create tag instance with required fields
         tag = Tag(id=api_data.get('id'), name=api_data.get('name', ''),  # Ensure name is never None
-                  description=api_data.get('description'))
+                  description=api_data.get('description'), created_at=created_at)
 
         # Handle category data
-        category_data = api_data.get('category', {})
+        category_data = api_data.get('category')
         if category_data:
-            category = TagCategory()
-            category.id = category_data.get('id')
-            category.name = category_data.get('name')
+            category = TagCategory(id=category_data.get('id'), name=category_data.get('name'))
             tag.category = category
             tag.category_id = category.id
 
-        # Handle created_at timestamp
-        created_at = api_data.get('created_at')
-        if created_at:
-            tag.created_at = safe_parse_datetime(created_at)
-        else:
-            tag.created_at = datetime.now(timezone.utc)
-
         return tag
 
     except Exception as e:
@@ -480,8 +583,13 @@ def transform_tag(api_data: Dict[str, Any]) -> Optional[Tag]:
         return None
 
 
-def transform_applied_tag(api_data: Dict[str, Any]) -> Optional[Tag]:
-    """Transform API applied tag data to Tag model instance."""
+def transform_applied_tag(api_data: Dict[str, Any], *, now: Optional[datetime] = None) -> Optional[Tag]:
+    """Transform API applied tag data to Tag model instance.
+
+    Args:
+        api_data: Applied tag data from the API
+        now: Timestamp used when the tag has no created_at; defaults to the current time
+    """
     try:
         if not isinstance(api_data, dict):
             logger.error(f"Invalid applied tag data format: {type(api_data)}")
@@ -501,7 +609,7 @@ def transform_applied_tag(api_data: Dict[str, Any]) -> Optional[Tag]:
         if created_at:
             tag.created_at = safe_parse_datetime(created_at)
         else:
-            tag.created_at = datetime.now(timezone.utc)
+            tag.created_at = now or datetime.now(timezone.utc)
 
         return tag
 
@@ -527,10 +635,10 @@ def transform_product(api_data: Dict[str, Any]) -> Product:
     The subscription plans are stored in the product.subscription_plans relationship.
     """
     try:
-        product = Product(id=api_data.get('id'), sku=api_data.get('sku', ''), active=api_data.get('active', True), url=api_data.get('url'), product_name=api_data.get('product_name'), sub_category_id=api_data.get('sub_category_id', 0), product_desc=api_data.get('product_desc'), product_price=api_data.get('product_price'), product_short_desc=api_data.get('product_short_desc'), subscription_only=api_data.get('subscription_only', False), status=api_data.get('status', 1))
+        product = Product(**_copy_product_fields(api_data))
 
         # Handle subscription plans if they exist in the API response
-        subscription_plans_data = api_data.get('subscription_plans', [])
+        subscription_plans_data = api_data.get('subscription_plans')
         if subscription_plans_data and isinstance(subscription_plans_data, list):
             product.subscription_plans = []
             for plan_data in subscription_plans_data:
@@ -568,59 +676,65 @@ def transform_subscription_plan(api_data: Dict[str, Any], product_id: int) -> Su
 
 def transform_order(api_data: Dict[str, Any]) -> Order:
     """Transform order data from API to database model."""
-    status = safe_enum_convert(api_data.get('status'), OrderStatus)
-    source_type = safe_enum_convert(api_data.get('source_type'), OrderSourceType)
-
     # Handle product_id being '0' or 0
     product_id = api_data.get('product_id')
     if product_id in ('0', 0):
         product_id = None
 
-    return Order(id=api_data.get('id'), title=api_data.get('title'), status=status, recurring=api_data.get('recurring'), total=api_data.get('total'), notes=api_data.get('notes'), terms=api_data.get('terms'), order_type=api_data.get('order_type'), source_type=source_type, creation_date=safe_parse_datetime(api_data.get('creation_date')), modification_date=safe_parse_datetime(api_data.get('modification_date')), order_date=safe_parse_datetime(api_data.get('order_date')), lead_affiliate_id=api_data.get('lead_affiliate_id'), sales_affiliate_id=api_data.get('sales_affiliate_id'), total_paid=api_data.get('total_paid'), total_due=api_data.get('total_due'), refund_total=api_data.get('refund_total'), allow_payment=api_data.get('allow_payment'), allow_paypal=api_data.get('allow_paypal'), invoice_number=api_data.get('invoice_number'), contact_id=api_data.get('contact_id'), product_id=product_id, payment_gateway_id=api_data.get('payment_gateway_id'), subscription_plan_id=api_data.get('subscription_plan_id'))
+    return Order(**_copy_order_fields(api_data), product_id=product_id)
 
 
 def transform_order_item(api_data: Dict[str, Any]) -> OrderItem:
     """Transform order item data from API to database model."""
-    return OrderItem(id=api_data[
-        'id'], job_recurring_id=api_data.get('jobRecurringId'), name=api_data.get('name'), description=api_data.get('description'), type=api_data.get('type'), notes=api_data.get('notes'), quantity=api_data.get('quantity'), cost=api_data.get('cost'), price=api_data.get('price'), discount=api_data.get('discount'), special_id=api_data.get('specialId'), special_amount=api_data.get('specialAmount'), special_pct_or_amt=api_data.get('specialPctOrAmt'), product_id=api_data.get('product', {}).get('id') if api_data.get('product') else None, subscription_plan_id=api_data.get('subscriptionPlan', {}).get('id') if api_data.get('subscriptionPlan') else None)
+    product = api_data.get('product')
+    subscription_plan = api_data.get('subscriptionPlan')
+    return OrderItem(id=api_data['id'], **_copy_order_item_fields(api_data), product_id=product.get('id') if product else None, subscription_plan_id=subscription_plan.get('id') if subscription_plan else None)
+
+
+def transform_order_payment_row(api_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Transform API order payment data into the column values of an OrderPayment row, without building the model instance."""
+    return _copy_order_payment_fields(_as_mapping(api_data))
 
 
 def transform_order_payment(api_data: Dict[str, Any]) -> OrderPayment:
     """Transform API order payment data into an OrderPayment model instance."""
-    if not isinstance(api_data, dict):
-        api_data = api_data.__dict__
+    return OrderPayment(**transform_order_payment_row(api_data))
+
 
-    return OrderPayment(id=api_data.get('id'), order_id=api_data.get('order_id'), amount=api_data.get('amount'), note=api_data.get('note'), invoice_id=api_data.get('invoice_id'), payment_id=api_data.get('payment_id'), pay_date=safe_parse_datetime(api_data.get('pay_date')), pay_status=api_data.get('pay_status'), last_updated=safe_parse_datetime(api_data.get('last_updated')), skip_commission=api_data.get('skip_commission', False), refund_invoice_payment_id=api_data.get('refund_invoice_payment_id', 0), created_at=safe_parse_datetime(api_data.get('created_at')), modified_at=safe_parse_datetime(api_data.get('modified_at')))
+def transform_order_transaction_row(api_data: Dict[str, Any], *, now: Optional[datetime] = None) -> Dict[str, Any]:
+    """Transform API order transaction data into the column values of an OrderTransaction row, without building the model instance.
+
+    Args:
+        api_data: Order transaction data from the API
+        now: Creation and modification timestamp; defaults to the current time
+    """
+    now = now or datetime.now(timezone.utc)
+    return {**_copy_order_transaction_fields(api_data), 'created_at': now, 'modified_at': now}
 
 
-def transform_order_transaction(api_data: Dict[str, Any]) -> OrderTransaction:
-    """Transform API order transaction data into OrderTransaction model instance."""
-    return OrderTransaction(id=api_data.get('id'), test=api_data.get('test', False), amount=api_data.get('amount'), currency=api_data.get('currency'), gateway=api_data.get('gateway'), payment_date=safe_parse_datetime(api_data.get('paymentDate')), type=api_data.get('type'), status=api_data.get('status'), errors=api_data.get('errors'), contact_id=api_data.get('contact_id'), transaction_date=safe_parse_datetime(api_data.get('transaction_date')), gateway_account_name=api_data.get('gateway_account_name'), order_ids=api_data.get('order_ids'), collection_method=api_data.get('collection_method'), payment_id=api_data.get('payment_id'), created_at=datetime.now(timezone.utc), modified_at=datetime.now(timezone.utc))
+def transform_order_transaction(api_data: Dict[str, Any], *, now: Optional[datetime] = None) -> OrderTransaction:
+    """Transform API order transaction data into OrderTransaction model instance.
+
+    Args:
+        api_data: Order transaction data from the API
+        now: Creation and modification timestamp; defaults to the current time
+    """
+    return OrderTransaction(**transform_order_transaction_row(api_data, now=now))
 
 
 def transform_note(api_data: Dict[str, Any]) -> Note:
     """Transform API data to Note model."""
-    note_type = safe_enum_convert(api_data.get('type'), NoteType)
-    # Convert enum to string value if it exists
-    type_value = note_type.value if note_type else None
-
-    return Note(id=api_data.get('id'), contact_id=api_data.get('contact_id'), title=api_data.get('title'), body=api_data.get('body'), type=type_value,  # Use the string value instead of enum
-                created_at=safe_parse_datetime(api_data.get('created_at')), modified_at=safe_parse_datetime(api_data.get('modified_at')))
+    return Note(**_copy_note_fields(api_data))
 
 
 def transform_task(api_data: Dict[str, Any]) -> Task:
     """Transform task data from API to database model."""
-    status = safe_enum_convert(api_data.get('status'), TaskStatus)
-    priority = safe_enum_convert(api_data.get('priority'), TaskPriority)
-
-    return Task(id=api_data.get('id'), contact_id=api_data.get('contact_id'), title=api_data.get('title'), notes=api_data.get('notes'), priority=priority, status=status, type=api_data.get('type'), due_date=safe_parse_datetime(api_data.get('due_date')))
+    return Task(**_copy_task_fields(api_data))
 
 
 def transform_campaign(api_data: Dict[str, Any]) -> Campaign:
     """Transform campaign data from API to database model."""
-    status = safe_enum_convert(api_data.get('status'), CampaignStatus)
-
-    return Campaign(id=api_data.get('id'), name=api_data.get('name'), description=api_data.get('description'), status=status, created_at=safe_parse_datetime(api_data.get('created_at')), modified_at=safe_parse_datetime(api_data.get('modified_at')))
+    return Campaign(**_copy_campaign_fields(api_data))
 
 
 def transform_campaign_sequence(api_data: Dict[str, Any]) -> CampaignSequence:
@@ -630,9 +744,7 @@ def transform_campaign_sequence(api_data: Dict[str, Any]) -> CampaignSequence:
 
 def transform_subscription(api_data: Dict[str, Any]) -> Subscription:
     """Transform subscription data from API to database model."""
-    status = safe_enum_convert(api_data.get('status'), SubscriptionStatus)
-
-    return Subscription(id=api_data.get('id'), product_id=api_data.get('product_id'), subscription_plan_id=api_data.get('subscription_plan_id'), status=status, next_bill_date=safe_parse_datetime(api_data.get('next_bill_date')), contact_id=api_data.get('contact_id'), payment_gateway_id=api_data.get('payment_gateway_id'), credit_card_id=api_data.get('credit_card_id'), start_date=safe_parse_datetime(api_data.get('start_date')), end_date=safe_parse_datetime(api_data.get('end_date')), billing_cycle=api_data.get('billing_cycle'), created_at=safe_parse_datetime(api_data.get('created_at')), modified_at=safe_parse_datetime(api_data.get('modified_at')))
+    return Subscription(**_copy_subscription_fields(api_data))
 
 
 def transform_account_profile(api_data: Dict[str, Any]) -> AccountProfile:
@@ -659,14 +771,12 @@ def transform_business_goal(api_data: Dict[str, Any], account_profile_id: int) -
 
 def transform_affiliate(api_data: Dict[str, Any]) -> Affiliate:
     """Transform API affiliate data into an Affiliate model instance."""
-    status = safe_enum_convert(api_data.get('status'), AffiliateStatus)
-
-    return Affiliate(id=api_data.get('id'), code=api_data.get('code'), contact_id=api_data.get('contact_id'), name=api_data.get('name'), parent_id=api_data.get('parent_id'), status=status, notify_on_lead=api_data.get('notify_on_lead'), notify_on_sale=api_data.get('notify_on_sale'), track_leads_for=api_data.get('track_leads_for'))
+    return Affiliate(**_copy_affiliate_fields(api_data))
 
 
 def transform_affiliate_commission(api_data: Dict[str, Any]) -> AffiliateCommission:
     """Transform API affiliate commission data into an AffiliateCommission model instance."""
-    return AffiliateCommission(id=api_data.get('id'), affiliate_id=api_data.get('affiliate_id'), amount_earned=api_data.get('amount_earned'), contact_id=api_data.get('contact_id'), contact_first_name=api_data.get('contact_first_name'), contact_last_name=api_data.get('contact_last_name'), date_earned=safe_parse_datetime(api_data.get('date_earned')), description=api_data.get('description'), invoice_id=api_data.get('invoice_id'), product_name=api_data.get('product_name'), sales_affiliate_id=api_data.get('sales_affiliate_id'), sold_by_first_name=api_data.get('sold_by_first_name'), sold_by_last_name=api_data.get('sold_by_last_name'))
+    return AffiliateCommission(**_copy_affiliate_commission_fields(api_data))
 
 
 def transform_affiliate_program(api_data: Dict[str, Any]) -> AffiliateProgram:
@@ -686,7 +796,7 @@ def transform_affiliate_summary(api_data: Dict[str, Any]) -> AffiliateSummary:
 
 def transform_affiliate_clawback(api_data: Dict[str, Any]) -> AffiliateClawback:
     """Transform API affiliate clawback data into an AffiliateClawback model instance."""
-    return AffiliateClawback(id=api_data.get('id'), affiliate_id=api_data.get('affiliate_id'), amount=api_data.get('amount'), contact_id=api_data.get('contact_id'), date_earned=safe_parse_datetime(api_data.get('date_earned')), description=api_data.get('description'), family_name=api_data.get('family_name'), given_name=api_data.get('given_name'), invoice_id=api_data.get('invoice_id'), product_name=api_data.get('product_name'), sale_affiliate_id=api_data.get('sale_affiliate_id'), sold_by_family_name=api_data.get('sold_by_family_name'), sold_by_given_name=api_data.get('sold_by_given_name'), subscription_plan_name=api_data.get('subscription_plan_name'))
+    return AffiliateClawback(**_copy_affiliate_clawback_fields(api_data))
 
 
 def transform_affiliate_payment(api_data: Dict[str, Any]) -> AffiliatePayment:
@@ -749,6 +859,43 @@ def transform_payment_gateway(api_data: Dict[str, Any]) -> PaymentGateway:
         raise
 
 
+# Number of distinct date strings whose parsed value is kept
+DATE_CACHE_SIZE = 8192
+
+# ISO dates, optionally followed by a time, read without strptime
+_ISO_DATE_RE = re.compile(r'(\d{4})-(\d{2})-(\d{2})(?:[T ]\d{2}:\d{2}:\d{2}Z?)?')
+
+
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_date_cached(date_string: str) -> Optional[date]:
+    """Parse a date string, trying the ISO fast path before strptime and dateutil."""
+    match = _ISO_DATE_RE.fullmatch(date_string)
+    if match:
+        try:
+            return date(int(match[1]), int(match[2]), int(match[3]))
+        except ValueError:
+            # Out-of-range fields, which strptime would reject as well; let dateutil interpret them
+            pass
+    else:
+        # Only one of the formats can match a string's shape, so try just that one (e.g. unpadded fields)
+        if 'T' not in date_string:
+            fmt = '%Y-%m-%d'
+        elif date_string.endswith('Z'):
+            fmt = '%Y-%m-%dT%H:%M:%SZ'
+        else:
+            fmt = '%Y-%m-%dT%H:%M:%S'
+        try:
+            return datetime.strptime(date_string, fmt).date()
+        except ValueError:
+            pass
+
+    # If none of the formats work, try parsing as datetime first
+    parsed_datetime = safe_parse_datetime(date_string)
+    if parsed_datetime:
+        return parsed_datetime.date()
+    return None
+
+
 def safe_parse_date(date_string: Optional[str]) -> Optional[date]:
     """Safely parse a date string.
     
@@ -763,19 +910,17 @@ def safe_parse_date(date_string: Optional[str]) -> Optional[date]:
 
     try:
         if isinstance(date_string, str):
-            # Try different date formats
-            for fmt in ['%Y-%m-%d', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%dT%H:%M:%SZ']:
-                try:
-                    return datetime.strptime(date_string, fmt).date()
-                except ValueError:
-                    continue
-
-            # If none of the formats work, try parsing as datetime first
-            parsed_datetime = safe_parse_datetime(date_string)
-            if parsed_datetime:
-                return parsed_datetime.date()
-
+            return _parse_date_cached(date_string)
         return None
     except Exception as e:
         logger.warning(f"Failed to parse date '{date_string}': {str(e)}")
         return None
+
+
+# Related records of a contact payload, as (API field and relationship name,
+# transform function, description, whether the transform takes the contact ID).
+# Defined last because they reference the transform functions above.
+_CONTACT_CHILD_SPECS = (('email_addresses', transform_email_address, 'email address', True), ('phone_numbers', transform_phone_number, 'phone number', True),
+                        ('addresses', transform_contact_address, 'address', True), ('fax_numbers', transform_fax_number, 'fax number', True))
+_CONTACT_ENTITY_SPECS = (('opportunities', transform_opportunity, 'opportunity', False), ('tasks', transform_task, 'task', False), ('notes', transform_note, 'note', False),
+                         ('orders', transform_order_with_items, 'order', False), ('subscriptions', transform_subscription, 'subscription', False))
@@ -1,41 +1,166 @@
-import json
 import logging
 import os
+import sys
+import threading
+import time
 import traceback
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Dict, List, Optional
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
 
-class CustomJSONEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, Enum):
-            return obj.value
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        return str(obj)
+# Number of buffered error entries that triggers a write to the log file
+ERROR_FLUSH_ENTRIES = 128
+
+# Seconds an error entry may stay buffered before a timer writes it out
+ERROR_FLUSH_INTERVAL = 1.0
+
+# orjson options for error entries; additional data may be keyed by IDs rather than strings
+JSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize values orjson does not handle natively; enums by value and anything else as a string."""
+    if isinstance(obj, Enum):
+        return obj.value
+    return str(obj)
+
+
+class _IndentedJson:
+    """Log message argument that serializes its data as indented JSON only when the message is formatted."""
+
+    def __init__(self, data: Any):
+        self.data = data
+
+    def __str__(self) -> str:
+        try:
+            return orjson.dumps(self.data, default=_json_default, option=JSON_OPTIONS | orjson.OPT_INDENT_2).decode()
+        except Exception:
+            # Formatting runs inside the logging machinery; never fail the message over its data
+            return str(self.data)
 
 
 class ErrorLogger:
     def __init__(self, error_log_dir: str = 'logs/errors'):
         """Initialize the error logger.
         
+        Entries are buffered; call close() when done with the logger. The
+        global logger is closed at exit and on SIGTERM by global_logger.
+        
         Args:
             error_log_dir: Directory to store error logs
         """
         self.error_log_dir = error_log_dir
         os.makedirs(error_log_dir, exist_ok=True)
-        self.current_log_file = self._get_log_file_path()
+        self._start_log_day()
+        # Append handle of the current log file, opened on the first error and kept open
+        self._log_handle: Optional[BinaryIO] = None
+        # Serialized entries not yet written, the time by which they must be, and the timer that writes them then
+        self._pending: List[bytes] = []
+        self._flush_at = 0.0
+        self._flush_timer: Optional[threading.Timer] = None
+        # Loaders may log from several worker threads; serialize file appends
+        self._lock = threading.Lock()
         logger.info(f"Error logger initialized. Log file: {self.current_log_file}")
 
     def _get_log_file_path(self) -> str:
-        """Get the path for today's error log file."""
+        """Get the path for today's error log file, which holds one JSON entry per line."""
         date_str = datetime.now().strftime('%Y%m%d')
-        return os.path.join(self.error_log_dir, f'data_load_errors_{date_str}.json')
+        return os.path.join(self.error_log_dir, f'data_load_errors_{date_str}.jsonl')
+
+    def _start_log_day(self) -> None:
+        """Switch to today's log file and record when the next day starts."""
+        self.current_log_file = self._get_log_file_path()
+        # Epoch time of the next local midnight, so checking for a new day is a single comparison
+        self._rollover_at = datetime.combine(date.today() + timedelta(days=1), datetime.min.time()).timestamp()
+
+    def _write_line(self, line: bytes) -> None:
+        """Buffer a line for the log file, switching files when the day changes.
+
+        Bursts of errors are written with one call once ERROR_FLUSH_ENTRIES
+        lines are buffered or the oldest has waited ERROR_FLUSH_INTERVAL
+        seconds, by the next error or else by a timer. Callers must hold the lock.
+        """
+        now = time.time()
+        if now >= self._rollover_at:
+            # Entries buffered before midnight belong to the previous day's file
+            self._close_handle()
+            self._start_log_day()
+        if not self._pending:
+            self._flush_at = now + ERROR_FLUSH_INTERVAL
+            self._start_flush_timer()
+        self._pending.append(line)
+        if len(self._pending) >= ERROR_FLUSH_ENTRIES or now >= self._flush_at:
+            self._flush_pending()
 
-    def _format_error_entry(self, entity_type: str, entity_id: int, error_type: str, error_message: str, additional_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    def _start_flush_timer(self) -> None:
+        """Start a timer that writes the buffered lines if no later error does first; callers must hold the lock."""
+        if self._flush_timer is not None and self._flush_timer.is_alive():
+            return
+        self._flush_timer = threading.Timer(ERROR_FLUSH_INTERVAL, self._flush_on_timer)
+        # A pending timer must not keep the process alive; atexit writes what is left
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _flush_on_timer(self) -> None:
+        """Write the buffered lines when the flush timer fires."""
+        try:
+            with self._lock:
+                self._flush_timer = None
+                self._flush_pending()
+        except Exception as e:
+            logger.error(f"Failed to write to error log file: {str(e)}")
+
+    def _flush_pending(self) -> None:
+        """Write the buffered lines through the persistent handle; callers must hold the lock."""
+        if not self._pending:
+            return
+        if self._log_handle is None:
+            self._log_handle = open(self.current_log_file, 'ab')
+        self._log_handle.writelines(self._pending)
+        # Flush so the entries survive a crash and are visible to readers of the file
+        self._log_handle.flush()
+        self._pending.clear()
+
+    def _close_handle(self) -> None:
+        """Write the buffered lines and close the log file handle if it is open; callers must hold the lock."""
+        self._flush_pending()
+        if self._log_handle is not None:
+            self._log_handle.close()
+            self._log_handle = None
+
+    def flush(self, blocking: bool = True) -> bool:
+        """Write the buffered error entries to the log file.
+
+        Args:
+            blocking: Whether to wait for the lock; a signal handler must not,
+                as the code it interrupted may hold it
+
+        Returns:
+            True if the entries were written, False if the lock was busy
+        """
+        if not self._lock.acquire(blocking=blocking):
+            return False
+        try:
+            self._flush_pending()
+        finally:
+            self._lock.release()
+        return True
+
+    def close(self) -> None:
+        """Write the buffered error entries and close the log file handle; the next error reopens it."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._close_handle()
+
+    def _format_error_entry(self, entity_type: str, entity_id: int, error_type: str, error_message: str, additional_data: Optional[Dict[str, Any]] = None,
+                            exception: Optional[BaseException] = None) -> Dict[str, Any]:
         """Format an error entry with all relevant information.
         
         Args:
@@ -44,14 +169,23 @@ class ErrorLogger:
             error_type: Type of error (e.g., 'ValidationError', 'DatabaseError')
             error_message: Detailed error message
             additional_data: Any additional context data
+            exception: Exception whose traceback is recorded; defaults to the one being handled, if any
             
         Returns:
             Dict containing the formatted error entry
         """
+        if exception is not None:
+            stack_trace = ''.join(traceback.format_exception(type(exception), exception, exception.__traceback__))
+        elif sys.exc_info()[0] is not None:
+            stack_trace = traceback.format_exc()
+        else:
+            # Not called while handling an exception; there is no traceback to format
+            stack_trace = ''
         return {'timestamp': datetime.now().isoformat(), 'entity_type': entity_type, 'entity_id': entity_id, 'error_type': error_type, 'error_message': error_message,
-                'additional_data': additional_data or {}, 'stack_trace': traceback.format_exc()}
+                'additional_data': additional_data or {}, 'stack_trace': stack_trace}
 
-    def log_error(self, entity_type: str, entity_id: int, error_type: str, error_message: str, additional_data: Optional[Dict[str, Any]] = None) -> None:
+    def log_error(self, entity_type: str, entity_id: int, error_type: str, error_message: str, additional_data: Optional[Dict[str, Any]] = None,
+                  exception: Optional[BaseException] = None) -> None:
         """Log an error with structured data.
         
         Args:
@@ -60,32 +194,19 @@ class ErrorLogger:
             error_type: Type of error (e.g., 'ValidationError', 'DatabaseError')
             error_message: Detailed error message
             additional_data: Any additional context data
+            exception: Exception whose traceback is recorded; defaults to the one being handled, if any
         """
         try:
-            error_entry = self._format_error_entry(entity_type=entity_type, entity_id=entity_id, error_type=error_type, error_message=error_message, additional_data=additional_data)
+            error_entry = self._format_error_entry(entity_type=entity_type, entity_id=entity_id, error_type=error_type, error_message=error_message, additional_data=additional_data,
+                                                   exception=exception)
 
-            # Read existing errors if file exists
-            existing_errors = []
-            if os.path.exists(self.current_log_file):
-                with open(self.current_log_file, 'r') as f:
-                    try:
-                        existing_errors = json.load(f)
-                    except json.JSONDecodeError:
-                        logger.warning(f"Error reading existing error log file: {self.current_log_file}")
-                        # If file is corrupted, start fresh
-                        existing_errors = []
-
-            # Append new error
-            existing_errors.append(error_entry)
-
-            # Write back to file with pretty printing using custom encoder
-            with open(self.current_log_file, 'w') as f:
-                json.dump(existing_errors, f, indent=2, cls=CustomJSONEncoder)
-
-            # Log to console for immediate visibility
-            logger.error(f"Error processing {entity_type} {entity_id}: {error_message}\n"
-                         f"Type: {error_type}\n"
-                         f"Additional Data: {json.dumps(additional_data or {}, indent=2, cls=CustomJSONEncoder)}")
+            # Append the entry as one line, so logging an error never rereads the file
+            line = orjson.dumps(error_entry, default=_json_default, option=JSON_OPTIONS | orjson.OPT_APPEND_NEWLINE)
+            with self._lock:
+                self._write_line(line)
+
+            # Log to console for immediate visibility; the additional data is only serialized if the record is emitted
+            logger.error("Error processing %s %s: %s\nType: %s\nAdditional Data: %s", entity_type, entity_id, error_message, error_type, _IndentedJson(additional_data or {}))
 
         except Exception as e:
             logger.error(f"Failed to write to error log file: {str(e)}")
@@ -103,9 +224,10 @@ class ErrorLogger:
             List of error entries
         """
         try:
+            self.flush()
             if os.path.exists(self.current_log_file):
-                with open(self.current_log_file, 'r') as f:
-                    errors = json.load(f)
+                with open(self.current_log_file, 'rb') as f:
+                    errors = [orjson.loads(line) for line in f if line.strip()]
                     if entity_type:
                         return [e for e in errors if e['entity_type'] == entity_type]
                     return errors
@@ -116,6 +238,9 @@ class ErrorLogger:
     def clear_errors(self) -> None:
         """Clear all error logs."""
         try:
+            with self._lock:
+                # Close the handle first, so later errors start a new file instead of writing to the removed one
+                self._close_handle()
             if os.path.exists(self.current_log_file):
                 os.remove(self.current_log_file)
                 logger.info(f"Cleared error log file: {self.current_log_file}")
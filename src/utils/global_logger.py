@@ -1,11 +1,20 @@
+import atexit
 import logging
+import signal
+import sys
+import threading
 from typing import Optional
 
 from .error_logger import ErrorLogger
 
+logger = logging.getLogger(__name__)
+
 # Global logger instances
 _error_logger: Optional[ErrorLogger] = None
 
+# Whether the exit and SIGTERM hooks that write the global error log have been installed
+_shutdown_hooks_installed = False
+
 
 def get_error_logger() -> ErrorLogger:
     """Get the global error logger instance.
@@ -16,11 +25,57 @@ def get_error_logger() -> ErrorLogger:
     global _error_logger
     if _error_logger is None:
         _error_logger = ErrorLogger()
+        _install_shutdown_hooks()
     return _error_logger
 
 
 def initialize_loggers() -> None:
     """Initialize all global loggers."""
     global _error_logger
+    if _error_logger is not None:
+        _error_logger.close()
     _error_logger = ErrorLogger()
+    _install_shutdown_hooks()
     logging.info("Global loggers initialized")
+
+
+def _close_error_logger() -> None:
+    """Write the buffered entries of the global error logger and close its file."""
+    if _error_logger is not None:
+        _error_logger.close()
+
+
+def _handle_sigterm(signum, frame) -> None:
+    """Write the buffered entries of the global error logger, then exit.
+
+    SIGTERM's default action skips atexit, so the handler exits through
+    SystemExit instead. If the interrupted code holds the logger's lock, the
+    atexit hook writes the entries once it has been released.
+    """
+    if _error_logger is not None:
+        try:
+            _error_logger.flush(blocking=False)
+        except Exception as e:
+            logger.error(f"Failed to write to error log file: {str(e)}")
+    sys.exit(128 + signum)
+
+
+def _install_shutdown_hooks() -> None:
+    """Install, once per process, the hooks that write the global error log at exit and on SIGTERM.
+
+    The hooks look up the current global logger when they run, so loggers
+    replaced by initialize_loggers are not kept alive. The SIGTERM handler is
+    only installed from the main thread and only if no other handler is set.
+    """
+    global _shutdown_hooks_installed
+    if _shutdown_hooks_installed:
+        return
+    _shutdown_hooks_installed = True
+    atexit.register(_close_error_logger)
+
+    if threading.current_thread() is not threading.main_thread() or signal.getsignal(signal.SIGTERM) is not signal.SIG_DFL:
+        return
+    try:
+        signal.signal(signal.SIGTERM, _handle_sigterm)
+    except (ValueError, OSError) as e:
+        logger.warning(f"Could not install SIGTERM handler for the error log: {str(e)}")
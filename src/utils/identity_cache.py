@@ -0,0 +1,105 @@
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Iterable, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, SessionTransaction
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of (model, ID) pairs remembered as existing for the whole run
+IDENTITY_CACHE_SIZE = 100000
+
+# Session.info key of the IDs found inside the session's current transaction, remembered once it commits
+PENDING_IDS_KEY = 'existing_ids_cache.pending'
+
+
+class ExistingIdCache:
+    """Process-local cache of the IDs of rows known to exist.
+
+    Many entities reference the same parent rows (e.g. thousands of tasks and
+    notes referencing one contact), so existence checks are answered from this
+    cache before querying. Only committed rows are remembered: IDs found
+    inside a transaction, which may be rows the transaction wrote itself, are
+    held until it commits and dropped if it or any of its savepoints rolls
+    back. Loads do not delete parent rows, so committed entries do not go
+    stale. Entries are evicted in least recently used order.
+    """
+
+    def __init__(self, max_size: int = IDENTITY_CACHE_SIZE):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of (model, ID) pairs to remember
+        """
+        self.max_size = max_size
+        self._ids: OrderedDict[Tuple[str, int], None] = OrderedDict()
+        # Loaders may check IDs from several worker threads
+        self._lock = threading.Lock()
+
+    def known(self, model: Any, ids: Iterable[int]) -> Set[int]:
+        """Return the IDs known to exist for model, marking them as recently used."""
+        name = model.__name__
+        with self._lock:
+            known_ids = {entity_id for entity_id in ids if (name, entity_id) in self._ids}
+            for entity_id in known_ids:
+                self._ids.move_to_end((name, entity_id))
+        return known_ids
+
+    def remember(self, model: Any, ids: Iterable[int]) -> None:
+        """Remember IDs found to exist for model, evicting the least recently used."""
+        name = model.__name__
+        with self._lock:
+            for entity_id in ids:
+                self._ids[(name, entity_id)] = None
+                self._ids.move_to_end((name, entity_id))
+            while len(self._ids) > self.max_size:
+                self._ids.popitem(last=False)
+
+    def remember_after_commit(self, session: Session, model: Any, ids: Iterable[int]) -> None:
+        """Remember IDs found to exist through session once its current transaction commits.
+
+        Args:
+            session: Session whose transaction the IDs were found in
+            model: Model of the table the IDs belong to
+            ids: IDs found to exist
+        """
+        ids = list(ids)
+        if not ids:
+            return
+        if not session.in_transaction():
+            self.remember(model, ids)
+            return
+        session.info.setdefault(PENDING_IDS_KEY, []).append((model, ids))
+
+    def clear(self) -> None:
+        """Forget all remembered IDs."""
+        with self._lock:
+            self._ids.clear()
+
+
+# Cache shared by all loaders of the process
+existing_ids_cache = ExistingIdCache()
+
+
+@event.listens_for(Session, 'after_commit')
+def _remember_committed_ids(session: Session) -> None:
+    """Remember the pending IDs of a session once its outermost transaction commits; releasing a savepoint keeps them pending."""
+    if session.in_nested_transaction():
+        return
+    for model, ids in session.info.pop(PENDING_IDS_KEY, ()):
+        existing_ids_cache.remember(model, ids)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _forget_rolled_back_ids(session: Session, previous_transaction: SessionTransaction) -> None:
+    """Drop the pending IDs of a session on any rollback; IDs found outside a rolled back savepoint are simply queried again."""
+    session.info.pop(PENDING_IDS_KEY, None)
+
+
+@event.listens_for(Session, 'after_transaction_end')
+def _forget_uncommitted_ids(session: Session, transaction: SessionTransaction) -> None:
+    """Drop the pending IDs of a session whose outermost transaction ended without committing, e.g. when it is closed."""
+    if transaction.parent is None:
+        session.info.pop(PENDING_IDS_KEY, None)
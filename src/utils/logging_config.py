@@ -1,12 +1,21 @@
+import atexit
 import logging
 import logging.handlers
+import queue
 from datetime import datetime
 from pathlib import Path
+from typing import Optional
+
+# Listener writing queued log records to the file and console handlers, replaced on each setup
+_listener: Optional[logging.handlers.QueueListener] = None
 
 
 def setup_logging(log_level: int = logging.INFO, log_dir: str = "logs", app_name: str = "keap_data_extract") -> None:
     """
     Configure application-wide logging
+
+    Loggers only put records on a queue; a listener thread writes them to
+    the log file and console, so logging threads never wait on disk I/O.
     
     Args:
         log_level: The logging level (default: INFO)
@@ -39,16 +48,20 @@ def setup_logging(log_level: int = logging.INFO, log_dir: str = "logs", app_name
     # Get the root logger
     root_logger = logging.getLogger()
 
-    # Remove any existing handlers
+    # Stop the listener of a previous setup, flushing its queued records, then remove any existing handlers
+    _stop_listener()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
 
     # Reset the root logger's level
     root_logger.setLevel(log_level)
 
-    # Add handlers to root logger
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    # Route the root logger through a queue drained by the file and console handlers
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    global _listener
+    _listener = logging.handlers.QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
 
     # Set logging level for third-party libraries
     logging.getLogger('urllib3').setLevel(logging.WARNING)
@@ -57,3 +70,15 @@ def setup_logging(log_level: int = logging.INFO, log_dir: str = "logs", app_name
     # Create logger for this module
     logger = logging.getLogger(__name__)
     logger.info(f"Logging initialized. Log file: {log_file}")
+
+
+def _stop_listener() -> None:
+    """Stop the current log listener, writing out the records still queued."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# Write out the records still queued when the process exits
+atexit.register(_stop_listener)
@@ -1,14 +1,185 @@
+import asyncio
+import collections
+import contextlib
 import logging
+import math
 import random
+import threading
 import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from functools import wraps
-from typing import Callable, Dict, Optional, Tuple, Type
+from typing import Callable, Dict, Iterator, Optional, Tuple, Type
 
 # Remove the circular import - we'll handle exceptions by name instead
 # from ..api.exceptions import KeapQuotaExhaustedError, KeapRateLimitError
 
 logger = logging.getLogger(__name__)
 
+# Shortest wait honoured from a Retry-After header, so a zero or past value does not retry in a tight loop
+MIN_RETRY_AFTER = 0.5
+
+# Maximum seconds of jitter added to a Retry-After wait
+RETRY_AFTER_JITTER = 1.0
+
+# Per-thread random generators for retry jitter, each seeded from the OS on creation
+_thread_rng = threading.local()
+
+
+def _rng() -> random.Random:
+    """Return the calling thread's random generator for retry jitter."""
+    rng = getattr(_thread_rng, 'rng', None)
+    if rng is None:
+        rng = _thread_rng.rng = random.Random()
+    return rng
+
+
+class AIMDController:
+    """Process-wide limit on concurrent calls, adapted to throttling by additive increase, multiplicative decrease.
+
+    Each successful call raises the limit by increase, up to max_limit; each
+    throttled call multiplies it by decrease, down to min_limit. Workers beyond
+    the current limit wait for a slot, so after a throttling burst the workers
+    resume gradually instead of all retrying at once.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, increase: float = 0.5, decrease: float = 0.5):
+        """Initialize the controller at its maximum limit.
+
+        Args:
+            max_limit: Maximum number of concurrent calls
+            min_limit: Minimum number of concurrent calls the limit is lowered to
+            increase: Amount added to the limit per successful call
+            decrease: Factor the limit is multiplied by per throttled call
+        """
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.limit = float(max_limit)
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    @contextlib.contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one of the concurrent call slots, waiting until the current limit allows another call."""
+        with self._condition:
+            while self._in_flight >= int(self.limit):
+                self._condition.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify()
+
+    def on_success(self) -> None:
+        """Raise the limit additively after a successful call."""
+        with self._condition:
+            if self.limit < self.max_limit:
+                self.limit = min(self.limit + self.increase, self.max_limit)
+                self._condition.notify_all()
+
+    def on_throttled(self) -> None:
+        """Lower the limit multiplicatively after a throttled call."""
+        with self._condition:
+            self.limit = max(self.limit * self.decrease, self.min_limit)
+            logger.info("Throttled; concurrent call limit lowered to %d", int(self.limit))
+
+
+class SlidingWindowLimiter:
+    """Process-wide admission limit of calls per sliding time window.
+
+    Calls wait until fewer than limit calls were admitted in the last window
+    seconds, so requests stay within a known throttle instead of finding it
+    through rate limit errors. Without a limit, calls are admitted at once.
+    """
+
+    def __init__(self, limit: Optional[int] = None, window: float = 60.0):
+        """Initialize the limiter.
+
+        Args:
+            limit: Maximum calls per window, or None until it is known
+            window: Length of the window in seconds
+        """
+        self.limit = limit
+        self.window = window
+        self._admitted: collections.deque = collections.deque()
+        self._lock = threading.Lock()
+
+    def set_limit(self, limit: Optional[int], window: float) -> None:
+        """Change the limit and window, e.g. once the server has reported its throttle."""
+        with self._lock:
+            if (limit, window) != (self.limit, self.window):
+                logger.info("Admitting at most %s calls per %.0f seconds", limit, window)
+                self.limit, self.window = limit, window
+
+    def acquire(self) -> None:
+        """Wait until the window admits another call, then record it."""
+        while True:
+            with self._lock:
+                if not self.limit:
+                    return
+                now = time.monotonic()
+                while self._admitted and now - self._admitted[0] >= self.window:
+                    self._admitted.popleft()
+                if len(self._admitted) < self.limit:
+                    self._admitted.append(now)
+                    return
+                wait = self.window - (now - self._admitted[0])
+            # Sleep outside the lock, then compete for the freed slot again
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """Process-wide pause of calls after repeated throttling.
+
+    After fail_threshold consecutive throttled calls the breaker opens, and
+    calls wait out the cool-off instead of each being sent and rejected.
+    Afterwards calls go through again (half-open); another throttled call
+    reopens the breaker at once, and a successful one closes it.
+    """
+
+    def __init__(self, fail_threshold: int = 3, cool_off: float = 30.0):
+        """Initialize a closed breaker.
+
+        Args:
+            fail_threshold: Consecutive throttled calls that open the breaker
+            cool_off: Seconds calls are paused for once the breaker opens
+        """
+        self.fail_threshold = fail_threshold
+        self.cool_off = cool_off
+        self._failures = 0
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    def remaining(self) -> float:
+        """Return the seconds until the breaker stops pausing calls, or 0 if it is not open."""
+        return max(self._open_until - time.monotonic(), 0.0)
+
+    def wait(self) -> None:
+        """Wait until the breaker is no longer open."""
+        remaining = self.remaining()
+        while remaining > 0:
+            time.sleep(remaining)
+            # The breaker may have been reopened while sleeping
+            remaining = self.remaining()
+
+    def record_failure(self) -> None:
+        """Count a throttled call, opening the breaker once the threshold is reached."""
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.fail_threshold and self.remaining() == 0:
+                self._open_until = time.monotonic() + self.cool_off
+                logger.warning("%d consecutive throttled calls; pausing calls for %.0f seconds", self._failures, self.cool_off)
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        if self._failures:
+            with self._lock:
+                self._failures = 0
+
 
 def get_throttle_retry_delay(headers: Dict[str, str], throttle_available: int, tenant_available: int) -> Optional[float]:
     """
@@ -26,16 +197,47 @@ def get_throttle_retry_delay(headers: Dict[str, str], throttle_available: int, t
     if throttle_available > 0 and tenant_available > 0:
         return None
 
+    # Wait as long as the server asks, plus a little jitter so waiting clients do not all retry at once
+    retry_after = parse_retry_after(headers.get('retry-after'))
+    if retry_after is not None:
+        return max(retry_after, MIN_RETRY_AFTER) + _rng().uniform(0, RETRY_AFTER_JITTER)
+
     # For throttle limits, wait for the next minute with some jitter
     # This prevents all clients from retrying at exactly the same time
     # Add extra jitter (0-10 seconds) to help prevent thundering herd
-    return 60.0 + random.uniform(0, 10.0)  # 60-70 seconds
+    return 60.0 + _rng().uniform(0, 10.0)  # 60-70 seconds
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header, given either as seconds or as an HTTP date
+
+    Args:
+        value: Header value, or None if the header is absent
+
+    Returns:
+        Seconds to wait, or None if the header is absent or malformed
+    """
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
 
 
 def safe_int_parse(value, default=0):
     """Safely parse integer from header value, handling empty strings"""
     if value is None or value == '':
         return default
+    # Header values are almost always plain digits; isdecimal (unlike isdigit) only accepts characters int() parses
+    if isinstance(value, str) and value.isdecimal():
+        return int(value)
     try:
         return int(value)
     except (ValueError, TypeError):
@@ -43,7 +245,8 @@ def safe_int_parse(value, default=0):
 
 
 def exponential_backoff(max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0, exponential_base: float = 2.0, jitter: bool = True, exceptions: Tuple[
-    Type[Exception], ...] = None) -> Callable:
+    Type[Exception], ...] = None, concurrency: Optional[AIMDController] = None, max_total_wait: Optional[float] = None,
+                        rate_limiter: Optional[SlidingWindowLimiter] = None, circuit_breaker: Optional[CircuitBreaker] = None) -> Callable:
     """
     Decorator that implements intelligent backoff for retrying operations, with special handling for Keap's throttle limits
     
@@ -52,8 +255,13 @@ def exponential_backoff(max_retries: int = 5, base_delay: float = 1.0, max_delay
         base_delay: Initial delay between retries in seconds (only used for non-rate-limit errors)
         max_delay: Maximum delay between retries in seconds
         exponential_base: Base for exponential calculation (only used for non-rate-limit errors)
-        jitter: Whether to add random jitter to delay (only used for non-rate-limit errors)
+        jitter: Whether to draw the delay uniformly between zero and its capped value (only used for non-rate-limit errors)
         exceptions: Tuple of exceptions to catch and retry on (KeapQuotaExhaustedError is never retried)
+        concurrency: Controller limiting concurrent calls of synchronous functions, lowered on rate limit errors
+        max_total_wait: Maximum seconds from the first call until the last retry starts; a retry whose delay
+            would pass it is not attempted (max_retries still applies)
+        rate_limiter: Limiter every call of a synchronous function, including retries, waits for before it is made
+        circuit_breaker: Breaker pausing all calls of synchronous functions after repeated rate limit errors
         
     Returns:
         Decorated function with retry logic
@@ -65,68 +273,128 @@ def exponential_backoff(max_retries: int = 5, base_delay: float = 1.0, max_delay
     if exceptions is None:
         exceptions = (KeapRateLimitError,)
 
+    # Whether quota exhaustion can be caught at all; if not, caught exceptions need no quota check
+    quota_catchable = any(issubclass(KeapQuotaExhaustedError, exception) for exception in exceptions)
+
+    # Capped backoff delay of each attempt, computed once when the decorator is created
+    delay_schedule = tuple(min(base_delay * (exponential_base ** i), max_delay) for i in range(max_retries))
+
+    def backoff_delay(attempt: int) -> float:
+        """Return the exponential backoff delay for attempt, with full jitter: uniform between zero and the capped delay."""
+        delay = delay_schedule[attempt - 1]
+        if jitter:
+            delay = _rng().uniform(0, delay)
+        return delay
+
+    def compute_delay(e: Exception, attempt: int) -> Optional[float]:
+        """Return the delay in seconds before retrying after e, or None to retry immediately."""
+        # Special handling for rate limit errors
+        if isinstance(e, KeapRateLimitError):
+            # Extract throttle information from the error message
+            # Format: "Rate limit exceeded (TYPE, limit: X). Will retry after throttle period."
+            try:
+                # Headers of the last response, with keys lower-cased once so lookups match any casing;
+                # KeapRateLimitError always carries a dict, empty if there were none
+                headers = {key.lower(): value for key, value in e.response_headers.items()}
+
+                # Get throttle values from headers with safe defaults
+                throttle_available = safe_int_parse(headers.get('x-keap-product-throttle-available'))
+                tenant_available = safe_int_parse(headers.get('x-keap-tenant-throttle-available'))
+
+                # Calculate delay based on throttle type
+                delay = get_throttle_retry_delay(headers, throttle_available, tenant_available)
+
+                if delay is None:
+                    # If we have available requests, retry immediately
+                    logger.info("Throttle headers indicate requests are available, retrying immediately")
+                    return None
+
+                logger.warning("Throttle limit hit. Waiting %.2f seconds before retry. Available: Throttle=%s, Tenant=%s", delay, throttle_available, tenant_available)
+
+            except (ValueError, AttributeError) as parse_error:
+                # If we can't parse the error message or headers, fall back to exponential backoff
+                logger.warning("Could not parse throttle error: %s. Using exponential backoff.", parse_error)
+                delay = backoff_delay(attempt)
+        else:
+            # For non-rate-limit errors, use standard exponential backoff
+            delay = backoff_delay(attempt)
+            logger.warning("Attempt %d/%d failed. Retrying in %.2f seconds. Error: %s", attempt, max_retries, delay, e)
+
+        return delay
+
+    def check_retryable(e: Exception, attempt: int) -> None:
+        """Re-raise e if it must not be retried: quota exhaustion, or attempt exceeds max_retries."""
+        # Never retry on quota exhaustion
+        if quota_catchable and isinstance(e, KeapQuotaExhaustedError):
+            raise e
+        if attempt > max_retries:
+            logger.error("Max retries (%d) exceeded. Last error: %s", max_retries, e)
+            raise e
+
+    def check_deadline(e: Exception, delay: Optional[float], deadline: float) -> None:
+        """Re-raise e if waiting delay seconds would pass the deadline."""
+        if delay is not None and time.monotonic() + delay > deadline:
+            logger.error("Retry deadline of %.2f seconds would be exceeded. Last error: %s", max_total_wait, e)
+            raise e
+
     def decorator(func: Callable) -> Callable:
+        # Coroutine functions get a wrapper that waits with asyncio.sleep, so a
+        # backoff does not block the event loop running other requests
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                attempt = 0
+                deadline = time.monotonic() + max_total_wait if max_total_wait is not None else math.inf
+                while True:
+                    try:
+                        return await func(*args, **kwargs)
+                    except exceptions as e:
+                        attempt += 1
+                        check_retryable(e, attempt)
+                        delay = compute_delay(e, attempt)
+                        check_deadline(e, delay, deadline)
+                        if delay is not None:
+                            await asyncio.sleep(delay)
+
+            return async_wrapper
+
+        def call(*args, **kwargs):
+            """Call func once admitted by the rate limiter, within a concurrency slot, feeding its outcome back to the controllers."""
+            if circuit_breaker is not None:
+                circuit_breaker.wait()
+            if rate_limiter is not None:
+                # Wait for admission before taking a slot, so waiting calls do not hold one
+                rate_limiter.acquire()
+            # The slot is released before any backoff sleep, so waiting retries do not hold it
+            with concurrency.slot() if concurrency is not None else contextlib.nullcontext():
+                try:
+                    result = func(*args, **kwargs)
+                except KeapRateLimitError:
+                    if concurrency is not None:
+                        concurrency.on_throttled()
+                    if circuit_breaker is not None:
+                        circuit_breaker.record_failure()
+                    raise
+            if concurrency is not None:
+                concurrency.on_success()
+            if circuit_breaker is not None:
+                circuit_breaker.record_success()
+            return result
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            last_exception = None
             attempt = 0
-
-            while attempt <= max_retries:
+            deadline = time.monotonic() + max_total_wait if max_total_wait is not None else math.inf
+            while True:
                 try:
-                    return func(*args, **kwargs)
+                    return call(*args, **kwargs)
                 except exceptions as e:
-                    # Never retry on quota exhaustion
-                    if isinstance(e, KeapQuotaExhaustedError):
-                        raise
-
-                    last_exception = e
                     attempt += 1
-
-                    if attempt > max_retries:
-                        logger.error(f"Max retries ({max_retries}) exceeded. Last error: {str(e)}")
-                        raise
-
-                    # Special handling for rate limit errors
-                    if isinstance(e, KeapRateLimitError):
-                        # Extract throttle information from the error message
-                        # Format: "Rate limit exceeded (TYPE, limit: X). Will retry after throttle period."
-                        try:
-                            # Get headers from the last response if available
-                            headers = getattr(e, 'response_headers', {}) or {}
-
-                            # Get throttle values from headers with safe defaults
-                            throttle_available = safe_int_parse(headers.get('x-keap-product-throttle-available'))
-                            tenant_available = safe_int_parse(headers.get('x-keap-tenant-throttle-available'))
-
-                            # Calculate delay based on throttle type
-                            delay = get_throttle_retry_delay(headers, throttle_available, tenant_available)
-
-                            if delay is None:
-                                # If we have available requests, retry immediately
-                                logger.info("Throttle headers indicate requests are available, retrying immediately")
-                                continue
-
-                            logger.warning(f"Throttle limit hit. Waiting {delay:.2f} seconds before retry. "
-                                           f"Available: Throttle={throttle_available}, Tenant={tenant_available}")
-
-                        except (ValueError, AttributeError) as parse_error:
-                            # If we can't parse the error message or headers, fall back to exponential backoff
-                            logger.warning(f"Could not parse throttle error: {parse_error}. Using exponential backoff.")
-                            delay = min(base_delay * (exponential_base ** (attempt - 1)), max_delay)
-                            if jitter:
-                                delay = delay * (0.5 + random.random())
-                    else:
-                        # For non-rate-limit errors, use standard exponential backoff
-                        delay = min(base_delay * (exponential_base ** (attempt - 1)), max_delay)
-                        if jitter:
-                            delay = delay * (0.5 + random.random())
-                        logger.warning(f"Attempt {attempt}/{max_retries} failed. "
-                                       f"Retrying in {delay:.2f} seconds. Error: {str(e)}")
-
-                    time.sleep(delay)
-
-            # This should never be reached due to the raise in the loop
-            raise last_exception
+                    check_retryable(e, attempt)
+                    delay = compute_delay(e, attempt)
+                    check_deadline(e, delay, deadline)
+                    if delay is not None:
+                        time.sleep(delay)
 
         return wrapper
 